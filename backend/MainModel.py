@@ -3,25 +3,69 @@ from PyQt6.QtWidgets import QApplication
 
 from backend.Settings import Settings
 from backend.handlers.SerialPortHandler import SerialPortHandler
+from backend.handlers.SerialPortWatcher import SerialPortWatcher
 from backend.handlers.TelemetryHandler import TelemetryHandler
+from backend.handlers.AcquisitionManager import AcquisitionManager
+from backend.handlers.SessionRecorder import SessionRecorder
+from backend.handlers.AcquisitionClient import AcquisitionClient
+from backend.handlers.ServicePortHandler import ServicePortHandler
 
 class MainModel:
     # Model attributes
     count = 0
 
-    def __init__(self, app: QApplication) -> None:
+    def __init__(self, app: QApplication, service_socket: str | None = None) -> None:
+        """With service_socket, telemetry comes from a headless acquisition service (service.py) that owns the port"""
         self.app = app
+        self.service_socket = service_socket
         self.settings = Settings(app)
         self.settings.load()
         self.settings.apply()
 
-        self.serial = SerialPortHandler()
-        self.serial.auto_connect(include_manufacturer="arduino", baudrate=1000000)
-        self.serial.set_wait_time(10)
+        self.port_watcher = SerialPortWatcher()
 
-        self.telemetry = TelemetryHandler()
-        self.telemetry.on_error.connect(self.serial.error)
-        self.serial.data_received.connect(self.telemetry.handle_serial_data)
+        if service_socket:
+            # Same on_block and on_error signals as a TelemetryHandler. The service owns the port,
+            # the serial menu and the terminal send their requests to it instead of opening the port here
+            self.telemetry = AcquisitionClient(service_socket, name="gui")
+            self.serial = ServicePortHandler(self.telemetry, port_watcher=self.port_watcher)
+            self.telemetry.open()
+        else:
+            self.serial = SerialPortHandler(threaded=True, port_watcher=self.port_watcher)
+            self.serial.set_wait_time(10)
+            self.serial.auto_connect(include_manufacturer="arduino", baudrate=1000000)
+            self.telemetry = TelemetryHandler(batch=True)
+            self.telemetry.on_error.connect(self.serial.error)
+            self.serial.data_received.connect(self.telemetry.handle_serial_data)
+
+        self._acquisition: AcquisitionManager | None = None
+
+        # Raw capture of long runs, created by start_recording
+        self.recorder: SessionRecorder | None = None
+
+    @property
+    def acquisition(self) -> AcquisitionManager:
+        """Additional boards streaming at the same time, see AcquisitionManager.add_port. Created on first use"""
+        if self._acquisition is None:
+            self._acquisition = AcquisitionManager(port_watcher=self.port_watcher)
+        return self._acquisition
+
+    def can_record(self) -> bool:
+        """The acquisition service does not forward raw bytes to the GUI, there is nothing to record here"""
+        return not self.service_socket
+
+    def start_recording(self, path: str) -> SessionRecorder:
+        """Record everything the serial port receives to a session file, see SessionRecorder"""
+        if self.recorder is None:
+            # Its writer thread is stopped when the application quits
+            self.recorder = SessionRecorder()
+            self.recorder.error.connect(self.serial.error)
+        self.recorder.start(path, self.serial)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.stop()
 
     # Model methods
     def increment_count(self):
@@ -0,0 +1,146 @@
+from PyQt6.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal
+from PyQt6.QtNetwork import QLocalSocket
+import base64
+
+from backend.handlers.TelemetryHandler import TelemetryBlock
+from backend.handlers.AcquisitionService import DEFAULT_SOCKET
+from utils.BlockStream import (MessageDecoder, decode_block, decode_json, encode_json,
+                               MSG_HELLO, MSG_INFO, MSG_BLOCK, MSG_STATUS, MSG_COMMAND)
+
+class AcquisitionClient(QObject):
+    """
+    Receives the sample blocks of an AcquisitionService and emits them like a TelemetryHandler does, so pages
+    work the same on a local port or on a service. A 'viewer' may miss blocks when it falls behind,
+    counted in dropped_samples; a 'recorder' receives every one. Reconnects while the service is away.
+    """
+    on_block = pyqtSignal(object)           # TelemetryBlock with timestamps
+    on_error = pyqtSignal(str)
+    connected = pyqtSignal(bool)            # Port status of the service
+    service_connected = pyqtSignal(bool)    # Socket status
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, role: str = 'viewer', name: str = '', reconnect_ms: int = 1000):
+        super().__init__()
+        self.socket_path = socket_path
+        self.role = role
+        self.name = name
+        self.columns: tuple[str, ...] = ()
+        self.port_name = ''
+        self.is_connected = False
+        self.next_sequence: int | None = None
+        self.dropped_samples = 0
+        self._decoder = MessageDecoder()
+        self._closing = False
+
+        self.socket = QLocalSocket(self)
+        self.socket.connected.connect(self._on_socket_connected)
+        self.socket.disconnected.connect(self._on_socket_disconnected)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.errorOccurred.connect(self._on_socket_error)
+
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(max(1, int(reconnect_ms)))
+        self.reconnect_timer.timeout.connect(self.open)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    def open(self) -> None:
+        self._closing = False
+        if self.socket.state() == QLocalSocket.LocalSocketState.UnconnectedState:
+            self.socket.connectToServer(self.socket_path)
+
+    def close(self) -> None:
+        self._closing = True
+        self.reconnect_timer.stop()
+        self.socket.disconnectFromServer()
+
+    def is_service_connected(self) -> bool:
+        return self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+
+    def request_connect(self, port_name: str = '', baudrate: int = 0) -> None:
+        """Ask the service to open port_name, or its own port when empty"""
+        command = {'command': 'connect'}
+        if port_name:
+            command.update(port=port_name, baudrate=int(baudrate))
+        self._send(encode_json(MSG_COMMAND, command))
+
+    def request_disconnect(self) -> None:
+        self._send(encode_json(MSG_COMMAND, {'command': 'disconnect'}))
+
+    def request_reset(self) -> None:
+        """Ask the service for a DTR/RTS reset pulse"""
+        self._send(encode_json(MSG_COMMAND, {'command': 'reset'}))
+
+    def request_send(self, data: bytes) -> None:
+        """Ask the service to write data to its port"""
+        self._send(encode_json(MSG_COMMAND, {'command': 'send', 'data': base64.b64encode(bytes(data)).decode('ascii')}))
+
+    def _send(self, message: bytes) -> None:
+        if self.is_service_connected():
+            self.socket.write(message)
+
+    def _on_socket_connected(self) -> None:
+        self._decoder = MessageDecoder()
+        self.next_sequence = None
+        self.socket.write(encode_json(MSG_HELLO, {'role': self.role, 'name': self.name}))
+        self.service_connected.emit(True)
+
+    def _on_socket_disconnected(self) -> None:
+        self.service_connected.emit(False)
+        if self.is_connected:
+            self.is_connected = False
+            self.connected.emit(False)
+        if not self._closing:
+            self.reconnect_timer.start()
+
+    def _on_socket_error(self, error: QLocalSocket.LocalSocketError) -> None:
+        if not self.is_service_connected() and not self._closing:
+            # Service not running (yet), reported while the socket is still connecting
+            self.reconnect_timer.start()
+
+    def _on_ready_read(self) -> None:
+        try:
+            messages = self._decoder.feed(self.socket.readAll().data())
+        except ValueError as e:
+            self.on_error.emit(f"Acquisition service stream: {e}")
+            self.socket.abort()
+            return
+        for kind, payload in messages:
+            # A corrupt or version-skewed service must not raise in this slot, it would take the GUI down
+            try:
+                self._on_message(kind, payload)
+            except (ValueError, KeyError, TypeError) as e:
+                self.on_error.emit(f"Acquisition service stream: malformed message ({e!r})")
+                self.socket.abort()
+                return
+
+    def _on_message(self, kind: int, payload: bytes) -> None:
+        if kind == MSG_BLOCK:
+            self._on_block_message(payload)
+            return
+        message = decode_json(payload)
+        if kind == MSG_INFO:
+            self.columns = tuple(str(column) for column in message['columns'])
+            self.port_name = str(message.get('port', ''))
+            self._set_connected(bool(message.get('connected')))
+        elif kind == MSG_STATUS:
+            if 'port' in message:
+                self.port_name = str(message['port'])
+            if 'connected' in message:
+                self._set_connected(bool(message['connected']))
+            if 'error' in message:
+                self.on_error.emit(str(message['error']))
+
+    def _on_block_message(self, payload: bytes) -> None:
+        sequence, timestamps, values = decode_block(payload)
+        if self.next_sequence is not None and sequence > self.next_sequence:
+            self.dropped_samples += sequence - self.next_sequence
+        self.next_sequence = sequence + values.shape[0]
+        self.on_block.emit(TelemetryBlock(values, self.columns, timestamps))
+
+    def _set_connected(self, status: bool) -> None:
+        if status != self.is_connected:
+            self.is_connected = status
+            self.connected.emit(status)
@@ -0,0 +1,134 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from dataclasses import dataclass, field
+import time
+import typing
+import numpy as np
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.TelemetryHandler import TelemetryHandler, TelemetryBlock, BlockClock, IMU_FIELD_COUNT
+from utils.TelemetrySchema import TelemetrySchema, get_schema
+
+if typing.TYPE_CHECKING:
+    from backend.handlers.SerialPortWatcher import SerialPortWatcher
+
+# One merged sample: index of the source port in AcquisitionManager.sources, host receive time (time.monotonic) and the values.
+# Ports with a schema of fewer channels leave the rest NaN
+SAMPLE_DTYPE = np.dtype([('source', '<u2'), ('timestamp', '<f8'), ('values', '<f8', (IMU_FIELD_COUNT,))])
+
+@dataclass
+class PortStats:
+    connected: bool = False
+    bytes_per_second: int = 0
+    dropped_bytes_per_second: int = 0
+    records_per_second: int = 0
+    records_total: int = 0
+    malformed_lines: int = 0
+
+@dataclass
+class AcquisitionPort:
+    source: int
+    name: str
+    serial: SerialPortHandler
+    telemetry: TelemetryHandler
+    stats: PortStats = field(default_factory=PortStats)
+    records_this_second: int = 0
+    clock: BlockClock = field(default_factory=BlockClock)
+
+class AcquisitionManager(QObject):
+    """
+    Owns one threaded SerialPortHandler and TelemetryHandler per port and merges their decoded samples
+    into one stream of SAMPLE_DTYPE records tagged with the source port and the receive time.
+    Every port delivers its batches through its own queued connection, so each one only adds its own parsing cost.
+    """
+    samples_received = pyqtSignal(object)   # np.ndarray of SAMPLE_DTYPE, the samples of one port's batch
+    port_connected = pyqtSignal(str, bool)
+    stats_updated = pyqtSignal(object)      # dict[str, PortStats], once per second
+    error = pyqtSignal(str, str)            # port name, message
+
+    def __init__(self, port_watcher: "SerialPortWatcher | None" = None):
+        super().__init__()
+        self.port_watcher = port_watcher
+        self.ports: dict[str, AcquisitionPort] = {}
+        self.sources: list[str] = []    # Port name of every source index ever assigned
+
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self._on_stats_timeout)
+        self.stats_timer.start(1000)
+
+    def add_port(self, name: str, baudrate: int = 115200, batch_interval_ms: int = 10,
+                 schema: TelemetrySchema | str | None = None) -> AcquisitionPort:
+        """
+        Create the handlers of a port, decoding with schema (or the name of a registered one) if given.
+        Configure framing or formats on the returned port's serial and telemetry before connecting
+        """
+        if name in self.ports:
+            raise ValueError(f"Port {name} is already managed")
+        schema = get_schema(schema) if isinstance(schema, str) else schema
+        if schema is not None and len(schema.columns) > IMU_FIELD_COUNT:
+            raise ValueError(f"Schema {schema.name!r} has {len(schema.columns)} channels, merged samples hold {IMU_FIELD_COUNT}")
+        serial = SerialPortHandler(threaded=True, port_watcher=self.port_watcher)
+        serial.selected_port = SerialPortData(name=name, baudrate=baudrate)
+        serial.set_wait_time(batch_interval_ms)
+        telemetry = TelemetryHandler(batch=True)
+        if schema is not None:
+            telemetry.set_schema(schema)
+
+        if name in self.sources:
+            source = self.sources.index(name)
+        else:
+            source = len(self.sources)
+            self.sources.append(name)
+        port = AcquisitionPort(source=source, name=name, serial=serial, telemetry=telemetry)
+        self.ports[name] = port
+
+        serial.data_received.connect(telemetry.handle_serial_data)
+        telemetry.on_block.connect(lambda block, port=port: self._on_block(port, block))
+        telemetry.on_error.connect(lambda message, name=name: self.error.emit(name, message))
+        serial.error.connect(lambda message, name=name: self.error.emit(name, message))
+        serial.connected.connect(lambda status, port=port: self._on_connected(port, status))
+        serial.bytes_per_second.connect(lambda value, port=port: setattr(port.stats, 'bytes_per_second', value))
+        serial.dropped_bytes_per_second.connect(lambda value, port=port: setattr(port.stats, 'dropped_bytes_per_second', value))
+        return port
+
+    def remove_port(self, name: str) -> None:
+        port = self.ports.pop(name, None)
+        if port is None:
+            return
+        port.serial.shutdown()
+
+    def connect_all(self) -> int:
+        """Connect every port that is not open, return how many opened"""
+        return sum(1 for port in self.ports.values() if not port.serial.is_open() and port.serial.connect())
+
+    def disconnect_all(self) -> None:
+        for port in self.ports.values():
+            port.serial.disconnect()
+
+    def stats(self) -> dict[str, PortStats]:
+        return {name: port.stats for name, port in self.ports.items()}
+
+    def _on_connected(self, port: AcquisitionPort, status: bool) -> None:
+        port.stats.connected = status
+        port.clock.reset()
+        self.port_connected.emit(port.name, status)
+
+    def _on_block(self, port: AcquisitionPort, block: TelemetryBlock) -> None:
+        n = len(block)
+        samples = np.empty(n, dtype=SAMPLE_DTYPE)
+        samples['source'] = port.source
+        samples['timestamp'] = port.clock.timestamps(block)
+        if block.shape[1] == IMU_FIELD_COUNT:
+            samples['values'] = block.data
+        else:
+            samples['values'] = np.nan
+            samples['values'][:, :block.shape[1]] = block.data
+        port.records_this_second += n
+        port.stats.records_total += n
+        self.samples_received.emit(samples)
+
+    def _on_stats_timeout(self) -> None:
+        for port in self.ports.values():
+            port.stats.records_per_second = port.records_this_second
+            port.stats.malformed_lines = port.telemetry.malformed_lines
+            port.records_this_second = 0
+        self.stats_updated.emit(self.stats())
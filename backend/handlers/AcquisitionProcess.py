@@ -0,0 +1,155 @@
+from PyQt6.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal
+import multiprocessing
+import queue
+import typing
+import numpy as np
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.TelemetryHandler import TelemetryHandler, BlockClock, IMU_CSV_SCHEMA
+from utils.SharedSampleRing import SharedSampleRing, LOCK_FREE
+from utils.TelemetrySchema import TelemetrySchema, get_schema
+
+# How often the child checks for commands and the parent for events, both are (name, argument) tuples
+COMMAND_POLL_MS = 10
+EVENT_POLL_MS = 20
+
+def _run_acquisition(port_name: str, baudrate: int, schema: TelemetrySchema, ring_name: str, ring_lock: typing.Any, wait_time_ms: int,
+                     reset_timing: typing.Tuple[int, int], commands: multiprocessing.Queue, events: multiprocessing.Queue) -> None:
+    """Child process: a SerialPortHandler and TelemetryHandler of its own, writing decoded samples into the ring"""
+    app = QCoreApplication([])
+    ring = SharedSampleRing.attach(ring_name, writable=True, lock=ring_lock)
+    serial = SerialPortHandler(threaded=False)
+    serial.selected_port = SerialPortData(name=port_name, baudrate=baudrate)
+    serial.set_wait_time(wait_time_ms)
+    serial.set_reset_timing(*reset_timing)
+    telemetry = TelemetryHandler(batch=True)
+    telemetry.set_schema(schema)
+    serial.data_received.connect(telemetry.handle_serial_data)
+
+    state = {'records': 0}
+    clock = BlockClock()
+
+    def on_block(block) -> None:
+        state['records'] += len(block)
+        ring.write(block.data, clock.timestamps(block))
+
+    def on_connected(status: bool) -> None:
+        clock.reset()
+        events.put(('connected', status))
+
+    def on_stats(bytes_per_second: int) -> None:
+        events.put(('stats', {'bytes_per_second': bytes_per_second, 'records_per_second': state['records'],
+                              'malformed_lines': telemetry.malformed_lines, 'dropped_bytes': serial.dropped_bytes}))
+        state['records'] = 0
+
+    telemetry.on_block.connect(on_block)
+    telemetry.on_error.connect(lambda message: events.put(('error', message)))
+    serial.error.connect(lambda message: events.put(('error', message)))
+    serial.connected.connect(on_connected)
+    serial.bytes_per_second.connect(on_stats)
+
+    def poll_commands() -> None:
+        while True:
+            try:
+                command, _ = commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == 'connect':
+                serial.connect()
+            elif command == 'disconnect':
+                serial.disconnect()
+            elif command == 'stop':
+                serial.shutdown()
+                app.quit()
+                return
+
+    command_timer = QTimer()
+    command_timer.timeout.connect(poll_commands)
+    command_timer.start(COMMAND_POLL_MS)
+    app.exec()
+    ring.close()
+
+class AcquisitionProcess(QObject):
+    """
+    Runs a SerialPortHandler and the telemetry parsing of one port in a separate process, so they never compete
+    with the GUI for the GIL, and one process per port spreads several ports over several cores.
+    Decoded samples go to a SharedSampleRing (see utils/SharedSampleRing.py) that this process only reads:
+    call read_new() or latest() once per frame to copy the newest slice. Status comes back through the signals.
+    """
+    connected = pyqtSignal(bool)
+    error = pyqtSignal(str)
+    stats_updated = pyqtSignal(object)      # dict: bytes_per_second, records_per_second, malformed_lines, dropped_bytes
+
+    def __init__(self, port_name: str, baudrate: int = 115200, schema: TelemetrySchema | str = IMU_CSV_SCHEMA,
+                 capacity: int = 1 << 20, wait_time_ms: int = 10, reset_timing: typing.Tuple[int, int] = (100, 0)):
+        """capacity is the number of samples the ring keeps, reset_timing the DTR/RTS pulse and settle ms (0 for no pulse)"""
+        super().__init__()
+        self.schema = get_schema(schema) if isinstance(schema, str) else schema
+        self.port_name = port_name
+        self.columns = self.schema.columns
+        self.is_connected = False
+        self._read_position = 0
+
+        context = multiprocessing.get_context('spawn')     # Never fork a process that runs Qt
+        ring_lock = None if LOCK_FREE else context.Lock()   # Weakly ordered CPU, see utils/SharedSampleRing.py
+        self.ring = SharedSampleRing.create(capacity, len(self.columns), lock=ring_lock)
+        self._commands = context.Queue()
+        self._events = context.Queue()
+        self.process = context.Process(
+            target=_run_acquisition, name=f'Acquisition {port_name}', daemon=True,
+            args=(port_name, baudrate, self.schema, self.ring.name, ring_lock, wait_time_ms, tuple(reset_timing), self._commands, self._events))
+        self.process.start()
+
+        self.event_timer = QTimer()
+        self.event_timer.timeout.connect(self._poll_events)
+        self.event_timer.start(EVENT_POLL_MS)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def connect(self) -> None:
+        """Open the port in the child process, connected is emitted once it is"""
+        self._commands.put(('connect', None))
+
+    def disconnect(self) -> None:
+        self._commands.put(('disconnect', None))
+
+    def read_new(self, max_samples: int | None = None) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and (samples, columns) values written since the previous call, at most the newest max_samples"""
+        start, timestamps, values = self.ring.read(self._read_position, max_samples)
+        self._read_position = start + timestamps.shape[0]
+        return timestamps, values
+
+    def latest(self, count: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        return self.ring.latest(count)
+
+    def shutdown(self, timeout_s: float = 2.0) -> None:
+        if self.ring is None:
+            return
+        self.event_timer.stop()
+        if self.process.is_alive():
+            self._commands.put(('stop', None))
+            self.process.join(timeout_s)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.ring.close()
+        self.ring = None
+
+    def _poll_events(self) -> None:
+        while True:
+            try:
+                event, argument = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event == 'connected':
+                self.is_connected = argument
+                self.connected.emit(argument)
+            elif event == 'error':
+                self.error.emit(argument)
+            elif event == 'stats':
+                self.stats_updated.emit(argument)
+        if not self.process.is_alive() and self.is_connected:
+            self.is_connected = False
+            self.error.emit(f"Acquisition process of {self.port_name} exited with code {self.process.exitcode}")
+            self.connected.emit(False)
@@ -0,0 +1,161 @@
+from PyQt6.QtCore import QObject, QCoreApplication, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+from dataclasses import dataclass, field
+import base64
+import binascii
+import os
+import tempfile
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.TelemetryHandler import TelemetryHandler, TelemetryBlock, BlockClock, IMU_COLUMNS
+from utils.BlockStream import (MessageDecoder, encode_block, encode_json, decode_json,
+                               MSG_HELLO, MSG_INFO, MSG_STATUS, MSG_COMMAND)
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'acquisition.sock')
+CLIENT_ROLES = ('viewer', 'recorder')
+
+@dataclass
+class ServiceClient:
+    socket: QLocalSocket
+    role: str = 'viewer'
+    name: str = ''
+    blocks_sent: int = 0
+    blocks_dropped: int = 0
+    samples_dropped: int = 0
+    decoder: MessageDecoder = field(default_factory=MessageDecoder)
+
+class AcquisitionService(QObject):
+    """
+    Serves the decoded blocks of a SerialPortHandler and TelemetryHandler to any number of local socket clients
+    (see AcquisitionClient and utils/BlockStream.py), so GUIs can come and go while the port stays open.
+    Every block is encoded once. A viewer whose socket still holds viewer_buffer_bytes unsent skips the block
+    and sees a sequence gap; a recorder never skips one, its unsent data grows instead.
+    """
+    clients_changed = pyqtSignal(int)
+
+    def __init__(self, serial: SerialPortHandler, telemetry: TelemetryHandler, socket_path: str = DEFAULT_SOCKET,
+                 viewer_buffer_bytes: int = 4 << 20):
+        super().__init__()
+        self.serial = serial
+        self.telemetry = telemetry
+        self.socket_path = socket_path
+        self.viewer_buffer_bytes = int(viewer_buffer_bytes)
+        self.clients: list[ServiceClient] = []
+        self.sequence = 0               # Sequence number of the next sample
+        self._clock = BlockClock()
+        self._columns: tuple[str, ...] = telemetry.parser.schema.columns if telemetry.parser is not None else IMU_COLUMNS
+
+        self.server = QLocalServer()
+        self.server.newConnection.connect(self._on_new_connection)
+        telemetry.on_block.connect(self._on_block)
+        serial.connected.connect(self._on_serial_connected)
+        serial.error.connect(lambda message: self._broadcast(encode_json(MSG_STATUS, {'error': message})))
+        telemetry.on_error.connect(lambda message: self._broadcast(encode_json(MSG_STATUS, {'error': message})))
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    def listen(self) -> bool:
+        # A socket file left by a service that did not exit cleanly would block listen
+        QLocalServer.removeServer(self.socket_path)
+        return self.server.listen(self.socket_path)
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.socket.disconnected.disconnect()
+            client.socket.readyRead.disconnect()
+            client.socket.disconnectFromServer()
+        self.clients.clear()
+        self.server.close()
+
+    def _info(self) -> bytes:
+        port = self.serial.selected_port.name if self.serial.selected_port is not None else ''
+        return encode_json(MSG_INFO, {'columns': list(self._columns), 'port': port, 'connected': self.serial.is_open()})
+
+    def _on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            if socket is None:
+                break
+            client = ServiceClient(socket=socket)
+            self.clients.append(client)
+            socket.readyRead.connect(lambda client=client: self._on_ready_read(client))
+            socket.disconnected.connect(lambda client=client: self._on_disconnected(client))
+            socket.write(self._info())
+            self.clients_changed.emit(len(self.clients))
+
+    def _on_disconnected(self, client: ServiceClient) -> None:
+        if client in self.clients:
+            self.clients.remove(client)
+            client.socket.deleteLater()
+            self.clients_changed.emit(len(self.clients))
+
+    def _on_ready_read(self, client: ServiceClient) -> None:
+        try:
+            messages = client.decoder.feed(client.socket.readAll().data())
+        except ValueError:
+            client.socket.abort()
+            return
+        for kind, payload in messages:
+            # Clients are other processes, a malformed message is refused instead of raising in this slot
+            try:
+                message = decode_json(payload)
+                if kind == MSG_HELLO:
+                    client.role = message.get('role', 'viewer') if message.get('role') in CLIENT_ROLES else 'viewer'
+                    client.name = str(message.get('name', ''))
+                elif kind == MSG_COMMAND:
+                    self._on_command(message)
+            except ValueError as e:
+                client.socket.write(encode_json(MSG_STATUS, {'error': f"Malformed message from the client: {e}"}))
+
+    def _on_command(self, message: dict) -> None:
+        """Raises ValueError on a malformed command"""
+        command = message.get('command')
+        if command == 'connect':
+            port = message.get('port')
+            if port:
+                baudrate = message.get('baudrate') or self.serial.selected_port.baudrate
+                if not isinstance(baudrate, int) or isinstance(baudrate, bool) or baudrate <= 0:
+                    raise ValueError(f"Invalid baudrate {baudrate!r}")
+                # A port picked by a client replaces auto-connect
+                self.serial.stop_auto_connect()
+                self.serial.selected_port = SerialPortData(name=str(port), baudrate=baudrate)
+                self.serial.connect()
+            elif not self.serial.is_open():
+                self.serial.connect()
+        elif command == 'disconnect':
+            self.serial.disconnect()
+        elif command == 'reset':
+            self.serial.toggle_dtr_rts()
+        elif command == 'send':
+            try:
+                data = base64.b64decode(message.get('data', ''), validate=True)
+            except (binascii.Error, TypeError):
+                raise ValueError("send data is not base64") from None
+            self.serial.send_data(bytearray(data))
+
+    def _on_serial_connected(self, status: bool) -> None:
+        self._clock.reset()
+        port = self.serial.selected_port.name if self.serial.selected_port is not None else ''
+        self._broadcast(encode_json(MSG_STATUS, {'connected': status, 'port': port}))
+
+    def _on_block(self, block: TelemetryBlock) -> None:
+        timestamps = self._clock.timestamps(block)
+        if block.columns != self._columns:
+            self._columns = block.columns
+            self._broadcast(self._info())
+
+        message = encode_block(self.sequence, timestamps, block.data)
+        self.sequence += len(block)
+        for client in self.clients:
+            if client.role != 'recorder' and client.socket.bytesToWrite() + len(message) > self.viewer_buffer_bytes:
+                client.blocks_dropped += 1
+                client.samples_dropped += len(block)
+                continue
+            client.socket.write(message)
+            client.blocks_sent += 1
+
+    def _broadcast(self, message: bytes) -> None:
+        for client in self.clients:
+            client.socket.write(message)
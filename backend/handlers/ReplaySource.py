@@ -0,0 +1,208 @@
+from PyQt6.QtCore import pyqtSignal, QTimer, QEventLoop
+from dataclasses import dataclass
+import time
+import typing
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from utils.SessionFile import SessionReader
+
+Chunk = typing.Tuple[float, bytes]
+
+@dataclass
+class ReplayReport:
+    chunks: int = 0
+    bytes: int = 0
+    wall_time: float = 0.0
+    stream_time: float = 0.0            # Seconds of the source delivered
+    speed: float = 0.0                  # stream_time / wall_time
+    bytes_per_second: float = 0.0
+    max_lag: float = 0.0                # Largest delay in seconds of a chunk behind its due time
+    fell_behind: bool = False           # max_lag went over ReplaySource.max_lag
+    max_sustained_speed: float | None = None    # Fastest speed the pipeline kept up with, if measured
+    max_sustained_bytes_per_second: float | None = None
+
+class ReplaySource(SerialPortHandler):
+    """
+    Plays a recorded session or a synthetic stream through the same signals as a SerialPortHandler, with no hardware.
+    speed is 1.0 for real time, N for N times faster, None for as fast as possible. Downstream slots run
+    synchronously on delivery, so when the pipeline is too slow the chunks fall behind their due time;
+    the report says how far, and the fastest speed that was sustained.
+    """
+    replay_finished = pyqtSignal(object)    # ReplayReport
+
+    fast_slice_ms = 20  # As fast as possible: deliver for this long, then let the event loop run
+
+    def __init__(self, source: str | typing.Iterable[Chunk] | None = None, speed: float | None = 1.0,
+                 tick_ms: int = 5, max_lag: float = 0.25):
+        super().__init__(threaded=False)
+        self.selected_port = SerialPortData(name="replay", description="Replay source")
+        self.set_reset_timing(0)
+        self.max_lag = float(max_lag)
+        self.sent = bytearray()     # Everything written with send_data
+        self._source: str | typing.Iterable[Chunk] | None = source
+        self._chunks: typing.Iterator[Chunk] | None = None
+        self._next: Chunk | None = None
+        self._open = False
+        self._speed: float | None = None
+        self._ramp: tuple[float, float] | None = None  # factor, step seconds
+        self._error_string = ""
+
+        self.replay_timer = QTimer()
+        self.replay_timer.setInterval(max(1, int(tick_ms)))
+        self.replay_timer.timeout.connect(self._on_tick)
+        self._reset_report()
+        self.set_speed(speed)
+
+    def set_source(self, source: str | typing.Iterable[Chunk]) -> None:
+        """A session file path or an iterable of (t, data) chunks, see utils/SyntheticTelemetry.py"""
+        self._source = source
+
+    def set_speed(self, speed: float | None) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be > 0 or None")
+        self._rebase()
+        self._speed = speed
+
+    def ramp(self, start_speed: float = 1.0, factor: float = 1.5, step_s: float = 2.0) -> None:
+        """Raise the speed by factor every step_s seconds until the pipeline falls behind, to measure max_sustained_speed"""
+        self._ramp = (float(factor), float(step_s))
+        self.set_speed(start_speed)
+
+    def report(self) -> ReplayReport:
+        r = self._report
+        r.wall_time = (time.monotonic() - self._started) if self._started is not None else r.wall_time
+        r.speed = r.stream_time / r.wall_time if r.wall_time > 0 else 0.0
+        r.bytes_per_second = r.bytes / r.wall_time if r.wall_time > 0 else 0.0
+        if self._speed is None and self._ramp is None:
+            # Not paced, the pipeline itself was the limit
+            r.max_sustained_speed = r.speed
+            r.max_sustained_bytes_per_second = r.bytes_per_second
+        return r
+
+    def run_until_finished(self, timeout_s: float | None = None) -> ReplayReport:
+        """Connect if needed and run a local event loop until the source is exhausted, for headless use"""
+        loop = QEventLoop()
+        self.replay_finished.connect(loop.quit)
+        if timeout_s is not None:
+            QTimer.singleShot(int(timeout_s * 1000), loop.quit)
+        if self.is_open() or self.connect():
+            loop.exec()
+        self.replay_finished.disconnect(loop.quit)
+        return self.report()
+
+    # SerialPortHandler port operations, replaced by playback
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def _open_port(self) -> bool:
+        if self._source is None:
+            self._error_string = "No replay source"
+            return False
+        try:
+            self._chunks = iter(SessionReader(self._source).chunks() if isinstance(self._source, str) else self._source)
+        except (OSError, ValueError) as e:
+            self._error_string = str(e)
+            return False
+        self._next = next(self._chunks, None)
+        self._open = True
+        self._reset_report()
+        self._started = time.monotonic()
+        self._wall_start = self._started
+        self.replay_timer.start()
+        return True
+
+    def _open_error_string(self) -> str:
+        return self._error_string
+
+    def _close_port(self) -> None:
+        self.replay_timer.stop()
+        self._open = False
+        self._chunks = None
+        self._next = None
+
+    def _set_dtr_rts(self, dtr: bool, rts: bool) -> None:
+        pass
+
+    def list_serial_ports(self) -> typing.List[SerialPortData]:
+        return [self.selected_port]
+
+    def kill_port(self) -> None:
+        self.disconnect()
+
+    def send_data(self, data: bytearray) -> bool:
+        if not self.is_open():
+            self.error.emit("Cannot send data: Port is not open")
+            return False
+        self.sent.extend(data)
+        self.data_sent.emit(data)
+        return True
+
+    # Playback
+
+    def _reset_report(self) -> None:
+        self._report = ReplayReport()
+        self._started: float | None = None
+        self._wall_start = time.monotonic()
+        self._stream_offset = 0.0           # Stream time at _wall_start
+        self._step_start = self._wall_start
+        self._step_lag = 0.0
+
+    def _rebase(self) -> None:
+        """Keep the stream position when the speed changes"""
+        now = time.monotonic()
+        if self._speed is not None:
+            self._stream_offset += (now - self._wall_start) * self._speed
+        else:
+            self._stream_offset = self._report.stream_time
+        self._wall_start = now
+        self._step_start = now
+        self._step_lag = 0.0
+
+    def _deliver(self, t: float, data: bytes) -> None:
+        self._report.chunks += 1
+        self._report.bytes += len(data)
+        self._report.stream_time = t
+        self.receive_buffer.push(data)
+        self._handle_batch()
+
+    def _on_tick(self) -> None:
+        now = time.monotonic()
+        if self._speed is None:
+            deadline = now + self.fast_slice_ms / 1000.0
+            while self._next is not None and time.monotonic() < deadline:
+                self._deliver(*self._next)
+                self._next = next(self._chunks, None)
+        else:
+            target = self._stream_offset + (now - self._wall_start) * self._speed
+            while self._next is not None and self._next[0] <= target:
+                self._deliver(*self._next)
+                self._next = next(self._chunks, None)
+            if self._next is not None:
+                # How late the next chunk is once delivery is done, in stream seconds
+                done = self._stream_offset + (time.monotonic() - self._wall_start) * self._speed
+                lag = max(0.0, done - self._next[0]) / self._speed
+                self._step_lag = max(self._step_lag, lag)
+                self._report.max_lag = max(self._report.max_lag, lag)
+                if lag > self.max_lag:
+                    self._report.fell_behind = True
+            self._advance_ramp()
+
+        if self._next is None and self._open:
+            self.replay_timer.stop()
+            self.replay_finished.emit(self.report())
+
+    def _advance_ramp(self) -> None:
+        if self._ramp is None:
+            return
+        factor, step_s = self._ramp
+        if self._step_lag > self.max_lag:
+            self._ramp = None   # Fell behind, the last completed step is the answer
+            return
+        if time.monotonic() - self._step_start < step_s:
+            return
+        # Kept up for a whole step, record it and go faster
+        stream_rate = self._report.bytes / max(self._report.stream_time, 1e-9)
+        self._report.max_sustained_speed = self._speed
+        self._report.max_sustained_bytes_per_second = stream_rate * self._speed
+        self.set_speed(self._speed * factor)
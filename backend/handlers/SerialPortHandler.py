@@ -1,7 +1,14 @@
 from PyQt6.QtSerialPort import QSerialPort, QSerialPortInfo
-from PyQt6.QtCore import pyqtSignal, QObject, QThread, QTimer, pyqtBoundSignal
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, QThread, QTimer, QCoreApplication, Qt, pyqtBoundSignal
 import typing, dataclasses
 
+from utils.SerialFraming import FrameDecoder
+from utils.ReceiveBuffer import ReceiveBuffer
+from backend.handlers.SerialWriteQueue import SerialWriteQueue, FLOW_CONTROL_MODES
+
+if typing.TYPE_CHECKING:
+    from backend.handlers.SerialPortWatcher import SerialPortWatcher
+
 @dataclasses.dataclass
 class SerialPortData:
     name: str = "None"
@@ -21,42 +28,219 @@ class SerialPortData:
         return out if out else "None"
 
 class SerialPacketFilter(QObject):
-    received = pyqtSignal(bytearray)
+    """
+    Extracts the payloads between a header and a terminator.
+    Payloads are memoryviews into an immutable copy of the received bytes, so they stay valid after the signal.
+    """
+    received = pyqtSignal(object)       # memoryview, one frame. Only emitted if something is connected
+    received_batch = pyqtSignal(list)   # list[memoryview], every frame found in one processed chunk
+
     def __init__(self, header: bytes, terminator: bytes):
         super().__init__()
-        self.header = header
-        self.terminator = terminator
+        if not (header and terminator):
+            raise ValueError("Header and terminator must not be empty")
+        self.header = bytes(header)
+        self.terminator = bytes(terminator)
+        self.frames_received = 0
+
+    def emit_payloads(self, payloads: list) -> None:
+        if not payloads:
+            return
+        self.frames_received += len(payloads)
+        self.received_batch.emit(payloads)
+        if self.receivers(self.received) > 0:
+            for payload in payloads:
+                self.received.emit(payload)
 
     def process_buffer(self, buffer: bytearray):
-        if not (buffer and self.header and self.terminator):
-            return
+        """Standalone use: extract the frames in buffer and remove the consumed bytes from it in place"""
+        framer = SerialFramer([self])
+        framer.feed(buffer)
+        buffer[:] = framer.pending()
+
+class SerialFramer:
+    """
+    Framing engine running several SerialPacketFilters over one persistent receive buffer.
+    Data is appended at the end and consumed by advancing a read offset, the buffer is only compacted
+    once enough consumed bytes pile up. Frames of all filters are found in stream order in a single pass.
+    """
+    compact_threshold = 65536   # Compact the buffer when the consumed prefix grows beyond this many bytes
+    max_frame_size = 65536      # A header with no terminator within this many bytes is treated as noise
+
+    def __init__(self, filters: list[SerialPacketFilter] | None = None):
+        self.filters: list[SerialPacketFilter] = list(filters or [])
+        self.buffer = bytearray()
+        self.read_pos = 0
+
+    def add_filter(self, packet_filter: SerialPacketFilter) -> None:
+        if packet_filter not in self.filters:
+            self.filters.append(packet_filter)
+
+    def remove_filter(self, packet_filter: SerialPacketFilter) -> None:
+        if packet_filter in self.filters:
+            self.filters.remove(packet_filter)
+
+    def clear(self) -> None:
+        self.buffer.clear()
+        self.read_pos = 0
 
+    def pending(self) -> bytes:
+        """Bytes received but not consumed yet"""
+        return bytes(self.buffer[self.read_pos:])
+
+    def feed(self, data: bytes) -> None:
+        if not self.filters:
+            return
+        self.buffer.extend(data)
+        frames = self._scan()
+        if frames:
+            # One immutable copy for the whole batch, payloads are views into it
+            lo = frames[0][1]
+            block = memoryview(bytes(self.buffer[lo:frames[-1][2]]))
+            batches: dict[SerialPacketFilter, list] = {}
+            for packet_filter, start, stop in frames:
+                batches.setdefault(packet_filter, []).append(block[start - lo:stop - lo])
+            for packet_filter, payloads in batches.items():
+                packet_filter.emit_payloads(payloads)
+
+        if self.read_pos >= len(self.buffer):
+            self.clear()
+        elif self.read_pos >= self.compact_threshold:
+            del self.buffer[:self.read_pos]
+            self.read_pos = 0
+
+    def _scan(self) -> list:
+        """Return (filter, payload_start, payload_stop) of every complete frame and advance the read offset"""
+        buffer = self.buffer
+        end = len(buffer)
+        pos = self.read_pos
+        frames = []
+        next_header = {f: buffer.find(f.header, pos) for f in self.filters}
         while True:
-            # Find first header
-            header_pos = buffer.find(self.header)
+            candidates = [(h, f) for f, h in next_header.items() if h >= 0]
+            if not candidates:
+                # No header left, keep only a possible partial header at the end
+                keep = max(len(f.header) for f in self.filters) - 1
+                pos = max(pos, end - keep)
+                break
+            header_pos, packet_filter = min(candidates, key=lambda c: c[0])
+            start = header_pos + len(packet_filter.header)
+            terminator_pos = buffer.find(packet_filter.terminator, start)
+            if terminator_pos < 0:
+                if end - header_pos <= self.max_frame_size:
+                    pos = header_pos    # Incomplete frame, drop the noise before it and wait
+                    break
+                terminator_pos = -1
+            if terminator_pos >= 0:
+                frames.append((packet_filter, start, terminator_pos))
+                pos = terminator_pos + len(packet_filter.terminator)
+            else:
+                pos = header_pos + 1    # Oversized frame, skip its header
+            for f, h in next_header.items():
+                if 0 <= h < pos:
+                    next_header[f] = buffer.find(f.header, pos)
+        self.read_pos = pos
+        return frames
+
+def _configure_port(serial_port: QSerialPort, name: str, baudrate: int) -> None:
+    """Apply the default 8N1 settings without flow control to a QSerialPort"""
+    serial_port.setPortName(name)
+    serial_port.setBaudRate(baudrate)
+    serial_port.setDataBits(QSerialPort.DataBits.Data8)
+    serial_port.setParity(QSerialPort.Parity.NoParity)
+    serial_port.setStopBits(QSerialPort.StopBits.OneStop)
+    serial_port.setFlowControl(QSerialPort.FlowControl.NoFlowControl)
+
+def _read_port(serial_port: QSerialPort, receive_buffer: ReceiveBuffer) -> bytes:
+    """Read what fits the receive buffer when it blocks, everything otherwise"""
+    if receive_buffer.policy == 'block':
+        free = receive_buffer.free()
+        return serial_port.read(free) if free > 0 else b''
+    return serial_port.readAll().data()
+
+class SerialReaderWorker(QObject):
+    """
+    Owns a QSerialPort that lives in its own QThread.
+    Bytes are drained from the port as soon as they arrive into a shared ReceiveBuffer and the GUI thread
+    is notified once per batch, so a busy GUI event loop no longer stalls byte intake and the backlog stays bounded.
+    """
+    data_ready = pyqtSignal()           # Take the data with receive_buffer.take()
+    port_error = pyqtSignal(object)     # QSerialPort.SerialPortError
+
+    max_batch_size = 65536  # Flush early if a batch grows beyond this many bytes
+
+    def __init__(self, receive_buffer: ReceiveBuffer, batch_interval_ms: int = 5):
+        super().__init__()
+        self.serial_port = QSerialPort(self)    # Parented so it follows the worker to its thread
+        self.serial_port.readyRead.connect(self._handle_read)
+        self.serial_port.errorOccurred.connect(self.port_error.emit)
+        self.receive_buffer = receive_buffer
+        self.write_queue = SerialWriteQueue(self.serial_port, self)
+        self.open_ok = False
+        self.error_string = ""
+
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setInterval(max(1, int(batch_interval_ms)))
+        self.batch_timer.timeout.connect(self._flush)
+
+    @pyqtSlot(str, int)
+    def open_port(self, name: str, baudrate: int) -> None:
+        if self.serial_port.isOpen():
+            self.close_port()
+        _configure_port(self.serial_port, name, baudrate)
+        self.write_queue.apply_flow_control()
+        self.receive_buffer.clear()
+        self.apply_overflow_policy()
+        self.open_ok = self.serial_port.open(QSerialPort.OpenModeFlag.ReadWrite)
+        self.error_string = "" if self.open_ok else self.serial_port.errorString()
+        if self.open_ok:
+            self.batch_timer.start()
+
+    @pyqtSlot()
+    def close_port(self) -> None:
+        self.batch_timer.stop()
+        if self.serial_port.isOpen():
+            self._handle_read()
+            self.serial_port.close()
+        self.write_queue.clear()
+        self._flush()
 
-            if header_pos < 0:
-                # Keep only possible partial header tail
-                keep = len(self.header) - 1
-                buffer = buffer[-keep:] if keep > 0 else bytearray()
-                return
+    @pyqtSlot()
+    def apply_overflow_policy(self) -> None:
+        """When blocking, bound the port's own buffer too, so the backpressure reaches the driver"""
+        block = self.receive_buffer.policy == 'block'
+        self.serial_port.setReadBufferSize(self.receive_buffer.capacity if block else 0)
 
-            if header_pos > 0:
-                # Drop noise before header
-                buffer = buffer[header_pos:]
+    @pyqtSlot(int)
+    def set_batch_interval(self, interval_ms: int) -> None:
+        self.batch_timer.setInterval(max(1, int(interval_ms)))
 
-            # Find terminator after header
-            terminator_pos = buffer.find(self.terminator, len(self.header))
-            if terminator_pos < 0:
-                # Incomplete frame, wait for next read
-                return
+    @pyqtSlot(bytes)
+    def write(self, data: bytes) -> None:
+        if self.serial_port.isOpen():
+            self.write_queue.enqueue(data)
 
-            # Extract payload between header and terminator
-            data_chunk = buffer[len(self.header):terminator_pos]
-            self.received.emit(bytearray(data_chunk))  # emit copy
+    @pyqtSlot(bool, bool)
+    def set_dtr_rts(self, dtr: bool, rts: bool) -> None:
+        if self.serial_port.isOpen():
+            self.serial_port.setDataTerminalReady(dtr)
+            self.serial_port.setRequestToSend(rts)
 
-            # Remove processed frame and continue (handles multiple frames)
-            buffer = buffer[terminator_pos + len(self.terminator):]
+    @pyqtSlot()
+    def _handle_read(self) -> None:
+        if self.serial_port.bytesAvailable() > 0:
+            data = _read_port(self.serial_port, self.receive_buffer)
+            self.write_queue.on_received(data)
+            self.receive_buffer.push(data)
+            if len(self.receive_buffer) >= self.max_batch_size:
+                self._flush()
+
+    @pyqtSlot()
+    def _flush(self) -> None:
+        if self.receive_buffer.policy == 'block':
+            self._handle_read()     # Resume a reader blocked on a full buffer
+        if self.receive_buffer.claim_notification():
+            self.data_ready.emit()
 
 class SerialPortHandler(QObject):
     connected = pyqtSignal(bool)
@@ -66,36 +250,103 @@ class SerialPortHandler(QObject):
 
     data_received = pyqtSignal(bytearray)
     data_sent = pyqtSignal(bytearray)
+    write_report = pyqtSignal(object)   # WriteReport, every time the outbound queue drains
     bytes_per_second = pyqtSignal(int)
-    filters: list[SerialPacketFilter] = []  # List of SerialPacketFilter instances to process incoming data
 
-    max_buffer_size = 2048  # Define a maximum buffer size
+    frames_received = pyqtSignal(list)      # list[bytes], decoded payloads of one chunk when a framing mode is set
+    bad_crc_per_second = pyqtSignal(int)    # Frames dropped on a CRC mismatch, emitted along with bytes_per_second
+    resyncs_per_second = pyqtSignal(int)    # Malformed frames dropped, emitted along with bytes_per_second
+    dropped_bytes_per_second = pyqtSignal(int)  # Bytes lost to the receive buffer overflow policy, emitted along with bytes_per_second
+
+    reset_pulse_ms = 100    # How long DTR/RTS are held low to reset the device
+    reset_settle_ms = 0     # How long to wait after the pulse before the device is considered ready
+
+    max_buffer_size = 1 << 20   # Default receive buffer capacity in bytes, see set_overflow_policy
     bytes_received = 0      # Initialize bytes received counter
 
-    wait_timer = QTimer()
     wait_time_for_data = 0   # 0 means don't wait, process data immediately and emit signal. Any positive value means wait that amount of milliseconds after receiving data before processing and emitting signal. If new data is received during the wait, the timer resets.
 
-    def __init__(self):
+    # Commands for the reader worker (threaded mode only), delivered through queued connections
+    _worker_open = pyqtSignal(str, int)
+    _worker_close = pyqtSignal()
+    _worker_write = pyqtSignal(bytes)
+    _worker_set_lines = pyqtSignal(bool, bool)
+    _worker_set_batch_interval = pyqtSignal(int)
+    _worker_apply_overflow_policy = pyqtSignal()
+    _worker_configure_writes = pyqtSignal(int, int, int, object)
+
+    def __init__(self, threaded: bool = False, port_watcher: "SerialPortWatcher | None" = None):
+        """
+        If threaded is True, the QSerialPort lives in a dedicated QThread and received data is delivered in batches.
+        With a port_watcher, port lists come from its cached snapshot and auto_connect follows hotplug events.
+        """
         super().__init__()
-        self.serial_port = QSerialPort()
-        self.buffer = bytearray()  # Initialize buffer as a bytearray
-        self.serial_port.errorOccurred.connect(self._serial_error_handler)
-        self.serial_port.readyRead.connect(self._handle_read)
+        self.threaded = bool(threaded)
+        self.reader_thread: QThread | None = None
+        self.reader_worker: SerialReaderWorker | None = None
+        self._port_open = False
+        self.receive_buffer = ReceiveBuffer(self.max_buffer_size)   # Shared with the reader thread when threaded
+        self.receive_time = 0.0     # time.monotonic() when the reader had the chunk data_received is emitting
+        self._reported_dropped = 0
+        self._write_pacing = (0, 0, 0, None)  # chunk_size, interval_ms, max_in_flight, flow_control, see set_write_pacing
+
+        # DTR/RTS reset pulse, driven by a timer so the GUI thread never sleeps
+        self.reset_timer = QTimer()
+        self.reset_timer.setSingleShot(True)
+        self.reset_timer.timeout.connect(self._advance_reset)
+        self._reset_state = "idle"      # idle, pulse, settle
+        self._connect_pending = False   # connected is emitted once the reset completes
+
+        # Quiet time after the last read before data_received, see set_wait_time (non-threaded mode only)
+        self.wait_timer = QTimer(self)
+        self.wait_timer.setSingleShot(True)
+        self.wait_timer.timeout.connect(self._process_buffer_after_wait)
+        self.framer = SerialFramer()  # SerialPacketFilter instances to process incoming data
+        self.frame_decoder: FrameDecoder | None = None  # COBS/SLIP framing, see set_framing
+        self._reported_bad_crc = 0
+        self._reported_resyncs = 0
+        self._create_port()
         self.selected_port = SerialPortData()
 
+        self.port_watcher = port_watcher
+        self._auto_connect_args: tuple | None = None
+        if port_watcher is not None:
+            port_watcher.port_added.connect(self._on_port_added)
+            port_watcher.port_removed.connect(self._on_port_removed)
+
         self.bps_timer = QTimer()
         self.bps_timer.timeout.connect(self._on_bps_timeout)
         self.bps_timer.setSingleShot(False)
         self.bps_timer.setInterval(1000)  # Update every second
         self.bps_timer.start(1000)  # Update every second
 
-    # FIXME
-    # def add_filter(self, header: bytes, terminator: bytes, callback = None) -> None:
-    #     """Add a SerialPacketFilter to process incoming data"""
-    #     f = SerialPacketFilter(header, terminator)
-    #     f.received.connect(callback)
-    #     if f not in self.filters:
-    #         self.filters.append(f)
+    @property
+    def filters(self) -> list[SerialPacketFilter]:
+        return self.framer.filters
+
+    def add_filter(self, header: bytes, terminator: bytes, callback = None, batched: bool = False) -> SerialPacketFilter:
+        """Add a SerialPacketFilter to process incoming data. The callback receives one memoryview payload per frame, or a list of them per chunk if batched"""
+        f = SerialPacketFilter(header, terminator)
+        if callback is not None:
+            (f.received_batch if batched else f.received).connect(callback)
+        self.framer.add_filter(f)
+        return f
+
+    def remove_filter(self, packet_filter: SerialPacketFilter) -> None:
+        self.framer.remove_filter(packet_filter)
+
+    def set_framing(self, mode: str | None = None, crc: str | None = None) -> None:
+        """Decode the stream as 'cobs' or 'slip' frames with an optional 'crc16'/'crc32' trailer and emit frames_received. None disables framing"""
+        self.frame_decoder = FrameDecoder(mode, crc) if mode is not None else None
+        self._reported_bad_crc = 0
+        self._reported_resyncs = 0
+
+    def _decode_frames(self, data: bytes) -> None:
+        if self.frame_decoder is None:
+            return
+        payloads = self.frame_decoder.feed(data)
+        if payloads:
+            self.frames_received.emit(payloads)
 
     def set_baudrate(self, baudrate: int):
         """Set the baud rate for the serial port"""
@@ -104,7 +355,128 @@ class SerialPortHandler(QObject):
     def set_wait_time(self, timeout_ms: int):
         """Set the wait time for processing received data. 0 means process immediately, any positive value means wait that amount of milliseconds after receiving data before processing and emitting signal. If new data is received during the wait, the timer resets."""
         self.wait_time_for_data = timeout_ms
-        self.wait_timer.timeout.connect(self._process_buffer_after_wait)
+        if self.threaded and timeout_ms > 0:
+            # The reader thread batches periodically instead, a quiet-time wait would never fire on a continuous stream
+            self._worker_set_batch_interval.emit(timeout_ms)
+
+    def _create_port(self) -> None:
+        """Create the QSerialPort, in a reader thread if the handler is threaded"""
+        if not self.threaded:
+            self.serial_port = QSerialPort()
+            self.serial_port.errorOccurred.connect(self._serial_error_handler)
+            self.serial_port.readyRead.connect(self._handle_read)
+            self.write_queue = SerialWriteQueue(self.serial_port, self)
+            self.write_queue.configure(*self._write_pacing)
+            self.write_queue.report_ready.connect(self.write_report)
+            self.write_queue.write_error.connect(self.error)
+            return
+
+        self.reader_thread = QThread()
+        self.reader_worker = SerialReaderWorker(self.receive_buffer, batch_interval_ms=self.wait_time_for_data or 5)
+        self.reader_worker.moveToThread(self.reader_thread)
+        self.serial_port = self.reader_worker.serial_port    # Owned by the reader thread, do not call it directly
+
+        # Opening is blocking so connect() can still report success synchronously
+        self._worker_open.connect(self.reader_worker.open_port, Qt.ConnectionType.BlockingQueuedConnection)
+        self._worker_close.connect(self.reader_worker.close_port, Qt.ConnectionType.BlockingQueuedConnection)
+        self._worker_write.connect(self.reader_worker.write)
+        self._worker_set_lines.connect(self.reader_worker.set_dtr_rts)
+        self._worker_set_batch_interval.connect(self.reader_worker.set_batch_interval)
+        self._worker_apply_overflow_policy.connect(self.reader_worker.apply_overflow_policy)
+        self._worker_configure_writes.connect(self.reader_worker.write_queue.configure)
+        self.write_queue = self.reader_worker.write_queue    # Owned by the reader thread, use write_report for its state
+        self.write_queue.configure(*self._write_pacing)     # Not started yet, safe to call directly
+        self.write_queue.report_ready.connect(self.write_report)
+        self.write_queue.write_error.connect(self.error)
+        self.reader_worker.data_ready.connect(self._handle_batch)
+        self.reader_worker.port_error.connect(self._serial_error_handler)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_reader_thread)
+        self.reader_thread.start()
+
+    def _stop_reader_thread(self) -> None:
+        if self.reader_thread is None or self.reader_worker is None:
+            return
+        if self.reader_thread.isRunning():
+            if self._port_open:
+                self._worker_close.emit()
+            self.reader_thread.quit()
+            self.reader_thread.wait()
+        self.reader_worker.data_ready.disconnect(self._handle_batch)
+        self.reader_worker.port_error.disconnect(self._serial_error_handler)
+        for command in (self._worker_open, self._worker_close, self._worker_write, self._worker_set_lines,
+                        self._worker_set_batch_interval, self._worker_apply_overflow_policy, self._worker_configure_writes):
+            command.disconnect()
+        self._port_open = False
+        self.reader_worker.deleteLater()
+        self.reader_worker = None
+        self.reader_thread = None
+
+    def is_open(self) -> bool:
+        """Whether the serial port is currently open"""
+        if self.threaded:
+            return self._port_open
+        return self.serial_port is not None and self.serial_port.isOpen()
+
+    def set_overflow_policy(self, policy: str, capacity: int | None = None) -> None:
+        """What to do when the receive buffer is full: 'drop_oldest', 'drop_newest' or 'block' (stop reading the port until it drains)"""
+        self.receive_buffer.set_policy(policy, capacity)
+        if self.threaded:
+            self._worker_apply_overflow_policy.emit()
+        elif self.serial_port is not None:
+            self.serial_port.setReadBufferSize(self.receive_buffer.capacity if policy == 'block' else 0)
+
+    def set_write_pacing(self, chunk_size: int = 0, interval_ms: int = 0, max_in_flight: int = 0, flow_control: str | None = None) -> None:
+        """
+        Send data in chunks of chunk_size bytes (0 = whole messages), interval_ms apart, with at most max_in_flight bytes
+        not yet confirmed by bytesWritten (0 = unlimited). flow_control 'xonxoff' pauses on XOFF from the device, 'rtscts' on CTS
+        """
+        if flow_control not in FLOW_CONTROL_MODES:
+            raise ValueError(f"Unknown flow control {flow_control!r}, expected one of {FLOW_CONTROL_MODES}")
+        self._write_pacing = (int(chunk_size), int(interval_ms), int(max_in_flight), flow_control)
+        if self.threaded:
+            self._worker_configure_writes.emit(*self._write_pacing)
+        elif self.write_queue is not None:
+            self.write_queue.configure(*self._write_pacing)
+
+    @property
+    def dropped_bytes(self) -> int:
+        """Bytes lost to the overflow policy since the handler was created"""
+        return self.receive_buffer.dropped
+
+    def _open_port(self) -> bool:
+        if not self.threaded:
+            _configure_port(self.serial_port, self.selected_port.name, self.selected_port.baudrate)
+            self.write_queue.apply_flow_control()
+            self.serial_port.setReadBufferSize(self.receive_buffer.capacity if self.receive_buffer.policy == 'block' else 0)
+            return self.serial_port.open(QSerialPort.OpenModeFlag.ReadWrite)
+        if self.reader_worker is None:
+            raise ValueError("Serial reader thread is not running")
+        self._worker_open.emit(self.selected_port.name, self.selected_port.baudrate)
+        self._port_open = self.reader_worker.open_ok
+        return self._port_open
+
+    def _open_error_string(self) -> str:
+        if self.threaded and self.reader_worker is not None:
+            return self.reader_worker.error_string
+        return self.serial_port.errorString()
+
+    def _close_port(self) -> None:
+        if not self.threaded:
+            self.serial_port.close()
+            self.write_queue.clear()
+            return
+        self._worker_close.emit()
+        self._port_open = False
+
+    def _set_dtr_rts(self, dtr: bool, rts: bool) -> None:
+        if not self.threaded:
+            self.serial_port.setDataTerminalReady(dtr)
+            self.serial_port.setRequestToSend(rts)
+            return
+        self._worker_set_lines.emit(dtr, rts)
 
     def connect(self):
         """Connect to a serial port with the specified baud rate"""
@@ -116,36 +488,32 @@ class SerialPortHandler(QObject):
             raise ValueError("Serial port object is not initialized")
 
         # Close any existing connection
-        if self.serial_port.isOpen():
-            self.serial_port.close()
+        if self.is_open():
+            self._close_port()
             
         try:
-            # Configure port with explicit settings
-            self.serial_port.setPortName(self.selected_port.name)
-            self.serial_port.setBaudRate(self.selected_port.baudrate)
-            self.serial_port.setDataBits(QSerialPort.DataBits.Data8)
-            self.serial_port.setParity(QSerialPort.Parity.NoParity)
-            self.serial_port.setStopBits(QSerialPort.StopBits.OneStop)
-            self.serial_port.setFlowControl(QSerialPort.FlowControl.NoFlowControl)
-            
-            # Try to open the port
-            if not self.serial_port.open(QSerialPort.OpenModeFlag.ReadWrite):
-                error_msg = f"Failed to open port {self.selected_port.name}: {self.serial_port.errorString()}"
+            # Configure port with explicit settings and try to open it
+            if not self._open_port():
+                error_msg = f"Failed to open port {self.selected_port.name}: {self._open_error_string()}"
                 self.error.emit(error_msg)
                 return False
             else:
                 # Clear buffer on new connection
-                self.buffer.clear()
-                self.connected.emit(True)
-                self.connected_status = True
-                self.toggle_dtr_rts()
+                self.receive_buffer.clear()
+                self.framer.clear()
+                if self.frame_decoder is not None:
+                    self.frame_decoder.reset()
+                self._connect_pending = True
+                self.toggle_dtr_rts()   # connected is emitted once the device is ready
                 return True
         except Exception as e:
             self.error.emit(f"Error connecting to port {self.selected_port.name}: {str(e)}")
             return False
         
     def list_serial_ports(self) -> typing.List[SerialPortData]:
-        """Lists all available serial ports with their information."""
+        """Lists all available serial ports with their information. Uses the port watcher's snapshot if there is one"""
+        if self.port_watcher is not None:
+            return self.port_watcher.available_ports()
         ports = []
         for info in QSerialPortInfo.availablePorts():
             port_data = SerialPortData(
@@ -163,20 +531,34 @@ class SerialPortHandler(QObject):
                      include_description: str | None = None, 
                      initial_delay: int = 100
                      ) -> None:
-        """Automatically connect to the first available serial port that is not excluded."""
+        """Automatically connect to the first available serial port that is not excluded. With a port watcher, reconnects when a matching port appears"""
+        self._auto_connect_args = (baudrate, exclude_manufacturer, include_manufacturer, include_description)
         self.auto_connect_timer = QTimer()
         self.auto_connect_timer.setSingleShot(True)
         self.auto_connect_timer.timeout.connect(lambda: self._try_auto_connect(baudrate, exclude_manufacturer, include_manufacturer, include_description))
         self.auto_connect_timer.start(initial_delay)  # Start the timer with the specified initial delay
     
+    def stop_auto_connect(self) -> None:
+        """Stop reconnecting when matching ports appear"""
+        self._auto_connect_args = None
+
+    def rescan_ports(self) -> None:
+        """Ask the port watcher for a fresh snapshot, ports_changed follows"""
+        if self.port_watcher is not None:
+            self.port_watcher.rescan()
+
     def _try_auto_connect(self, 
                           baudrate: int, 
                           exclude_manufacturer: str | None, 
                           include_manufacturer: str | None,
-                          include_description: str | None
+                          include_description: str | None,
+                          ports: typing.List[SerialPortData] | None = None
                           ) -> bool:
-        ports = self.list_serial_ports()
-        for port in ports:
+        """Try the given ports, or all available ports. Only an attempt over all ports reports a failure"""
+        if ports is None and self.port_watcher is not None and not self.port_watcher.has_snapshot():
+            return False    # The first snapshot is reported as port_added events, which retry
+        candidates = self.list_serial_ports() if ports is None else ports
+        for port in candidates:
             manufacturer = port.manufacturer.lower() if port.manufacturer else ""
             description = port.description.lower() if port.description else ""
 
@@ -193,17 +575,29 @@ class SerialPortHandler(QObject):
             if self.connect():
                 print(f"Automatically connected to {port.prettyPrint()}")
                 return True
-        self.error.emit("No suitable serial port found")
-        print("No suitable serial port found.")
+        if ports is None:
+            self.error.emit("No suitable serial port found")
+            print("No suitable serial port found.")
         return False
 
+    def _on_port_added(self, port: SerialPortData) -> None:
+        if self._auto_connect_args is None or self.is_open():
+            return
+        self._try_auto_connect(*self._auto_connect_args, ports=[port])
+
+    def _on_port_removed(self, port: SerialPortData) -> None:
+        if port.name == self.selected_port.name and self.is_open():
+            self.error.emit(f"Port {port.name} was removed. Disconnecting.")
+            self.disconnect()
+
     def disconnect(self) -> None:
         """Disconnect from the current serial port"""
         if self.serial_port is None:
             raise ValueError("Serial port object is not initialized")
         try:
-            if self.serial_port.isOpen():
-                self.serial_port.close()
+            self._cancel_reset()
+            if self.is_open():
+                self._close_port()
             self.connected.emit(False)
             self.connected_status = False
         except Exception as e:
@@ -212,29 +606,71 @@ class SerialPortHandler(QObject):
     def kill_port(self) -> None:
         if self.serial_port is None:
             raise ValueError("Serial port object is not initialized")
-        self.serial_port.errorOccurred.disconnect(self._serial_error_handler)
-        self.serial_port.readyRead.disconnect(self._handle_read)
-        self.disconnect()
+        if self.threaded:
+            self.disconnect()
+            self._stop_reader_thread()
+        else:
+            self.serial_port.errorOccurred.disconnect(self._serial_error_handler)
+            self.serial_port.readyRead.disconnect(self._handle_read)
+            self.disconnect()
+            self.write_queue.deleteLater()
         del self.serial_port
         self.serial_port = None
-        self.buffer.clear()
+        self.receive_buffer.clear()
         self.connected.emit(False)
         self.connected_status = False
-        self.serial_port = QSerialPort()
+        self._create_port()
         self.selected_port = SerialPortData()
-        self.serial_port.errorOccurred.connect(self._serial_error_handler)
-        self.serial_port.readyRead.connect(self._handle_read)
+
+    def set_reset_timing(self, pulse_ms: int, settle_ms: int = 0) -> None:
+        """Set how long the DTR/RTS reset pulse lasts and how long to wait after it before the device is ready. A pulse of 0 leaves the lines alone"""
+        self.reset_pulse_ms = max(0, int(pulse_ms))
+        self.reset_settle_ms = max(0, int(settle_ms))
+
+    def is_resetting(self) -> bool:
+        return self._reset_state != "idle"
+
+    def shutdown(self) -> None:
+        """Disconnect and stop the reader thread. The handler cannot be connected again afterwards"""
+        self.disconnect()
+        self._stop_reader_thread()
+        self.bps_timer.stop()
 
     def toggle_dtr_rts(self) -> None:
-        """Toggle DTR and RTS lines to wake up the device."""
+        """Toggle DTR and RTS lines to wake up the device. Returns immediately, the pulse is timed by reset_timer"""
         if self.serial_port is None:
             raise ValueError("Serial port object is not initialized")
-        if self.serial_port.isOpen():
-            self.serial_port.setDataTerminalReady(False)
-            self.serial_port.setRequestToSend(False)
-            QThread.msleep(100)  # Wait 100ms
-            self.serial_port.setDataTerminalReady(True)
-            self.serial_port.setRequestToSend(True)
+        if not self.is_open():
+            return
+        if self.reset_pulse_ms == 0:
+            # No reset, e.g. devices without modem lines such as ptys
+            self._reset_state = "settle"
+            self.reset_timer.start(self.reset_settle_ms)
+            return
+        self._set_dtr_rts(False, False)
+        self._reset_state = "pulse"
+        self.reset_timer.start(self.reset_pulse_ms)
+
+    def _advance_reset(self) -> None:
+        if not self.is_open():
+            self._cancel_reset()
+            return
+        if self._reset_state == "pulse":
+            self._set_dtr_rts(True, True)
+            if self.reset_settle_ms > 0:
+                self._reset_state = "settle"
+                self.reset_timer.start(self.reset_settle_ms)
+                return
+        self._reset_state = "idle"
+        if self._connect_pending:
+            self._connect_pending = False
+            self.connected_status = True
+            self.connected.emit(True)
+
+    def _cancel_reset(self) -> None:
+        self.reset_timer.stop()
+        self._reset_state = "idle"
+        self._connect_pending = False
 
     def send_str(self, char: str) -> bool:
         return self.send_data(bytearray(char, 'utf-8'))
@@ -243,14 +679,18 @@ class SerialPortHandler(QObject):
         """Send data to the serial port"""
         if self.serial_port is None:
             raise ValueError("Serial port object is not initialized")
-        if not self.serial_port.isOpen():
+        if not self.is_open():
             self.error.emit("Cannot send data: Port is not open")
             return False
 
         try:
-            bytes_written = self.serial_port.write(data)
+            if self.threaded:
+                # Written asynchronously by the reader thread
+                self._worker_write.emit(bytes(data))
+            else:
+                self.write_queue.enqueue(bytes(data))
             self.data_sent.emit(data)
-            return bytes_written == len(data)
+            return True
         except TypeError as e:
             self.error.emit(f"Data must be bytes or bytearray: {str(e)}. {type(data)} is not supported.")
             return False
@@ -260,9 +700,12 @@ class SerialPortHandler(QObject):
         
     def _process_buffer_after_wait(self) -> None:
         """Process buffer after waiting for more data"""
-        if self.buffer:
-            self.data_received.emit(self.buffer)       
-            self.buffer.clear()  # Clear buffer after emitting data
+        data = self.receive_buffer.take()
+        if data:
+            self.receive_time = self.receive_buffer.taken_time
+            self.data_received.emit(bytearray(data))
+        if self.receive_buffer.policy == 'block' and self.serial_port is not None and self.serial_port.bytesAvailable() > 0:
+            QTimer.singleShot(0, self._handle_read)    # Resume reading what was left in the port
             
 
     def _handle_read(self) -> None:
@@ -271,28 +714,37 @@ class SerialPortHandler(QObject):
             raise ValueError("Serial port object is not initialized")
         if self.serial_port.bytesAvailable() > 0:
             try:
-                raw_data = self.serial_port.readAll()
-                newData = bytes(raw_data.data())
+                newData = _read_port(self.serial_port, self.receive_buffer)
                 self.bytes_received += len(newData)  # Update bytes received counter
+                self.write_queue.on_received(newData)
+                self.framer.feed(newData)
+                self._decode_frames(newData)
                                 
                 if newData:
-                    self.buffer.extend(newData)
-                    # Always limit buffer size
-                    if len(self.buffer) > self.max_buffer_size:
-                        self.buffer = self.buffer[-self.max_buffer_size:]
+                    self.receive_buffer.push(newData)
 
                     if self.wait_time_for_data > 0:
                         if self.wait_timer.isActive():
                             self.wait_timer.stop()
                         self.wait_timer.start(self.wait_time_for_data)
                     else:
-                        self.data_received.emit(self.buffer)       
-                        self.buffer.clear()  # Clear buffer after emitting data
+                        self._process_buffer_after_wait()
 
                         
             except Exception as e:
                 self.error.emit(f"Error reading from serial port: {str(e)}")
 
+    def _handle_batch(self) -> None:
+        """Handle a batch of data from the reader thread, already grouped by the worker's batch interval"""
+        data = self.receive_buffer.take()
+        if not data:
+            return
+        self.bytes_received += len(data)
+        self.framer.feed(data)
+        self._decode_frames(data)
+        self.receive_time = self.receive_buffer.taken_time
+        self.data_received.emit(bytearray(data))
+
     # def _process_buffer_with_header(self) -> None:
     #     if not (self.buffer and self.header and self.terminator):
     #         return
@@ -365,6 +817,14 @@ class SerialPortHandler(QObject):
         """Handle bytes per second calculation"""
         self.bytes_per_second.emit(self.bytes_received)
         self.bytes_received = 0
+        dropped = self.receive_buffer.dropped
+        self.dropped_bytes_per_second.emit(dropped - self._reported_dropped)
+        self._reported_dropped = dropped
+        if self.frame_decoder is not None:
+            self.bad_crc_per_second.emit(self.frame_decoder.bad_crc - self._reported_bad_crc)
+            self.resyncs_per_second.emit(self.frame_decoder.resyncs - self._reported_resyncs)
+            self._reported_bad_crc = self.frame_decoder.bad_crc
+            self._reported_resyncs = self.frame_decoder.resyncs
         self.errors_per_second = 0
 
     def _serial_error_handler(self, error) -> None:
@@ -0,0 +1,105 @@
+from PyQt6.QtSerialPort import QSerialPortInfo
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, QThread, QTimer, QCoreApplication, Qt
+import dataclasses
+
+from backend.handlers.SerialPortHandler import SerialPortData
+
+def enumerate_serial_ports() -> list[SerialPortData]:
+    """Synchronous enumeration, can take tens of milliseconds with many USB devices"""
+    return [
+        SerialPortData(name=info.portName(), description=info.description(), manufacturer=info.manufacturer())
+        for info in QSerialPortInfo.availablePorts()
+    ]
+
+class _PortScanWorker(QObject):
+    ports_scanned = pyqtSignal(list)
+
+    def __init__(self, interval_ms: int):
+        super().__init__()
+        self.timer = QTimer(self)   # Parented so it follows the worker to its thread
+        self.timer.setInterval(max(1, int(interval_ms)))
+        self.timer.timeout.connect(self.scan)
+
+    @pyqtSlot()
+    def start(self) -> None:
+        self.scan()
+        self.timer.start()
+
+    @pyqtSlot()
+    def stop(self) -> None:
+        self.timer.stop()
+
+    @pyqtSlot(int)
+    def set_interval(self, interval_ms: int) -> None:
+        self.timer.setInterval(max(1, int(interval_ms)))
+
+    @pyqtSlot()
+    def scan(self) -> None:
+        self.ports_scanned.emit(enumerate_serial_ports())
+
+class SerialPortWatcher(QObject):
+    """
+    Enumerates the serial ports periodically on a background thread and keeps the last snapshot,
+    so the GUI thread never blocks on enumeration. Emits add/remove events when the set of ports changes.
+    """
+    ports_changed = pyqtSignal(list)    # list[SerialPortData], the new snapshot
+    port_added = pyqtSignal(object)     # SerialPortData
+    port_removed = pyqtSignal(object)   # SerialPortData
+
+    _worker_start = pyqtSignal()
+    _worker_stop = pyqtSignal()
+    _worker_scan = pyqtSignal()
+    _worker_set_interval = pyqtSignal(int)
+
+    def __init__(self, interval_ms: int = 1000):
+        super().__init__()
+        self.ports: list[SerialPortData] | None = None  # None until the first scan completes
+
+        self.scan_thread = QThread()
+        self.scan_worker = _PortScanWorker(interval_ms)
+        self.scan_worker.moveToThread(self.scan_thread)
+        self._worker_start.connect(self.scan_worker.start)
+        # Blocking, so the timer is stopped in its own thread before stop() quits that thread
+        self._worker_stop.connect(self.scan_worker.stop, Qt.ConnectionType.BlockingQueuedConnection)
+        self._worker_scan.connect(self.scan_worker.scan)
+        self._worker_set_interval.connect(self.scan_worker.set_interval)
+        self.scan_worker.ports_scanned.connect(self._on_ports_scanned)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        self.scan_thread.start()
+        self._worker_start.emit()
+
+    def available_ports(self) -> list[SerialPortData]:
+        """Copies of the last snapshot, empty until the first scan completes"""
+        return [dataclasses.replace(port) for port in self.ports or []]
+
+    def has_snapshot(self) -> bool:
+        return self.ports is not None
+
+    def rescan(self) -> None:
+        """Scan again now instead of waiting for the next interval"""
+        self._worker_scan.emit()
+
+    def set_interval(self, interval_ms: int) -> None:
+        self._worker_set_interval.emit(interval_ms)
+
+    def stop(self) -> None:
+        if not self.scan_thread.isRunning():
+            return
+        self._worker_stop.emit()
+        self.scan_thread.quit()
+        self.scan_thread.wait()
+
+    def _on_ports_scanned(self, ports: list[SerialPortData]) -> None:
+        if ports == self.ports:
+            return
+        old = {port.name: port for port in self.ports or []}
+        new = {port.name: port for port in ports}
+        self.ports = ports
+        for name in old.keys() - new.keys():
+            self.port_removed.emit(dataclasses.replace(old[name]))
+        for name in new.keys() - old.keys():
+            self.port_added.emit(dataclasses.replace(new[name]))
+        self.ports_changed.emit(self.available_ports())
@@ -0,0 +1,189 @@
+from PyQt6.QtSerialPort import QSerialPort
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, QTimer
+from collections import deque
+from dataclasses import dataclass
+import time
+import numpy as np
+
+XON = 0x11
+XOFF = 0x13
+FLOW_CONTROL_MODES = (None, 'xonxoff', 'rtscts')
+
+@dataclass
+class WriteReport:
+    bytes_written: int = 0          # Since the queue was created
+    pending_bytes: int = 0          # Queued or handed to the port but not written yet
+    messages: int = 0               # Completed send_data calls
+    throughput: float = 0.0         # Bytes per second while the queue was busy
+    latency_p50_ms: float = 0.0     # From enqueue until the last byte of a message was written
+    latency_p95_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+class SerialWriteQueue(QObject):
+    """
+    Outbound queue of a QSerialPort, living in the port's thread.
+    Data is written in chunks of chunk_size bytes, interval_ms apart, with at most max_in_flight bytes
+    handed to the port and not yet confirmed by bytesWritten. Writing pauses while the device sent XOFF
+    ('xonxoff') or deasserts CTS ('rtscts'). With the defaults everything is written at once.
+    """
+    report_ready = pyqtSignal(object)   # WriteReport, every time the queue drains
+    write_error = pyqtSignal(str)
+
+    cts_poll_ms = 5
+
+    def __init__(self, serial_port: QSerialPort, parent: QObject | None = None):
+        super().__init__(parent)
+        self.serial_port = serial_port
+        self.serial_port.bytesWritten.connect(self._on_bytes_written)
+        self.chunk_size = 0         # 0 writes each message at once
+        self.interval_ms = 0        # Pause between chunks
+        self.max_in_flight = 0      # 0 means unlimited
+        self.flow_control: str | None = None
+
+        self._messages: deque[bytes] = deque()
+        self._head_offset = 0       # Bytes of the first message already taken
+        self._queued = 0            # Bytes in _messages not taken yet
+        self._in_flight = 0
+        self._xoff = False
+
+        self._enqueued_total = 0
+        self._written_total = 0
+        self._completions: deque[tuple[int, float]] = deque()   # (end offset of a message, enqueue time)
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._messages_done = 0
+        self._busy_since: float | None = None
+        self._busy_time = 0.0
+        self._busy_bytes = 0
+
+        self.pacing_timer = QTimer(self)
+        self.pacing_timer.setSingleShot(True)
+        self.pacing_timer.timeout.connect(self._pump)
+
+    @pyqtSlot(int, int, int, object)
+    def configure(self, chunk_size: int, interval_ms: int, max_in_flight: int, flow_control: str | None) -> None:
+        if flow_control not in FLOW_CONTROL_MODES:
+            raise ValueError(f"Unknown flow control {flow_control!r}, expected one of {FLOW_CONTROL_MODES}")
+        self.chunk_size = max(0, int(chunk_size))
+        self.interval_ms = max(0, int(interval_ms))
+        self.max_in_flight = max(0, int(max_in_flight))
+        self.flow_control = flow_control
+        self._xoff = False
+        self.apply_flow_control()
+
+    def apply_flow_control(self) -> None:
+        """Let the driver enforce RTS/CTS as well, XON/XOFF is handled here so binary input is left untouched"""
+        hardware = QSerialPort.FlowControl.HardwareControl
+        self.serial_port.setFlowControl(hardware if self.flow_control == 'rtscts' else QSerialPort.FlowControl.NoFlowControl)
+
+    @pyqtSlot(bytes)
+    def enqueue(self, data: bytes) -> None:
+        if not data:
+            return
+        now = time.monotonic()
+        if self._busy_since is None:
+            self._busy_since = now
+        self._messages.append(bytes(data))
+        self._queued += len(data)
+        self._enqueued_total += len(data)
+        self._completions.append((self._enqueued_total, now))
+        self._pump()
+
+    def on_received(self, data: bytes) -> None:
+        """Track XON/XOFF sent by the device"""
+        if self.flow_control != 'xonxoff':
+            return
+        on = data.rfind(bytes([XON]))
+        off = data.rfind(bytes([XOFF]))
+        if on < 0 and off < 0:
+            return
+        self._xoff = off > on
+        if not self._xoff:
+            self._pump()
+
+    def pending_bytes(self) -> int:
+        return self._queued + self._in_flight
+
+    def clear(self) -> None:
+        """Drop everything not written yet"""
+        self.pacing_timer.stop()
+        self._messages.clear()
+        self._head_offset = 0
+        self._queued = 0
+        self._in_flight = 0
+        self._xoff = False
+        self._completions.clear()
+        self._enqueued_total = self._written_total
+        self._finish_busy_period()
+
+    def report(self) -> WriteReport:
+        latencies = np.fromiter(self._latencies, dtype=float) * 1000.0
+        busy_time = self._busy_time
+        busy_bytes = self._busy_bytes
+        if self._busy_since is not None:
+            busy_time += time.monotonic() - self._busy_since
+        return WriteReport(
+            bytes_written=self._written_total,
+            pending_bytes=self.pending_bytes(),
+            messages=self._messages_done,
+            throughput=busy_bytes / busy_time if busy_time > 0 else 0.0,
+            latency_p50_ms=float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+            latency_p95_ms=float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+            latency_max_ms=float(latencies.max()) if latencies.size else 0.0,
+        )
+
+    def _take_chunk(self) -> bytes:
+        size = self.chunk_size or self._queued
+        if self.max_in_flight:
+            size = min(size, max(1, self.max_in_flight - self._in_flight))
+        parts = []
+        while size > 0 and self._messages:
+            head = self._messages[0]
+            part = head[self._head_offset:self._head_offset + size]
+            parts.append(part)
+            size -= len(part)
+            self._head_offset += len(part)
+            if self._head_offset >= len(head):
+                self._messages.popleft()
+                self._head_offset = 0
+        chunk = parts[0] if len(parts) == 1 else b''.join(parts)
+        self._queued -= len(chunk)
+        return chunk
+
+    @pyqtSlot()
+    def _pump(self) -> None:
+        while self._queued:
+            if self.pacing_timer.isActive() or self._xoff or not self.serial_port.isOpen():
+                return
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return  # Resumed by bytesWritten
+            if self.flow_control == 'rtscts' and not self.serial_port.pinoutSignals() & QSerialPort.PinoutSignal.ClearToSendSignal:
+                self.pacing_timer.start(self.cts_poll_ms)
+                return
+            chunk = self._take_chunk()
+            written = self.serial_port.write(chunk)
+            if written != len(chunk):
+                self.write_error.emit(f"Write failed: {self.serial_port.errorString()}")
+                self.clear()
+                return
+            self._in_flight += written
+            if self.interval_ms > 0:
+                self.pacing_timer.start(self.interval_ms)
+
+    @pyqtSlot('qint64')
+    def _on_bytes_written(self, count: int) -> None:
+        self._in_flight = max(0, self._in_flight - count)
+        self._written_total += count
+        self._busy_bytes += count
+        now = time.monotonic()
+        while self._completions and self._completions[0][0] <= self._written_total:
+            self._latencies.append(now - self._completions.popleft()[1])
+            self._messages_done += 1
+        self._pump()
+        if self.pending_bytes() == 0 and self._busy_since is not None:
+            self._finish_busy_period()
+            self.report_ready.emit(self.report())
+
+    def _finish_busy_period(self) -> None:
+        if self._busy_since is not None:
+            self._busy_time += time.monotonic() - self._busy_since
+            self._busy_since = None
@@ -0,0 +1,64 @@
+import typing
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.AcquisitionClient import AcquisitionClient
+
+if typing.TYPE_CHECKING:
+    from backend.handlers.SerialPortWatcher import SerialPortWatcher
+
+class ServicePortHandler(SerialPortHandler):
+    """
+    Stands in for the GUI's SerialPortHandler when a headless acquisition service (service.py) owns the port.
+    Connect, disconnect, send and the DTR/RTS reset become requests to the service through an AcquisitionClient,
+    so the GUI never opens the port itself; connected follows the port status the service reports.
+    Port lists still come from this machine. Received bytes are not forwarded, only the decoded blocks of the client.
+    """
+    def __init__(self, client: AcquisitionClient, port_watcher: "SerialPortWatcher | None" = None):
+        super().__init__(threaded=False, port_watcher=port_watcher)
+        self.client = client
+        self.set_reset_timing(0)    # The service pulses the lines of its own port
+        self.bps_timer.stop()       # No bytes go through this handler
+        client.connected.connect(self._on_service_port)
+        client.on_error.connect(self.error)
+
+    # SerialPortHandler port operations, replaced by requests to the service
+
+    def is_open(self) -> bool:
+        return self.client.is_connected
+
+    def connect(self) -> bool:
+        if not self.selected_port.name or self.selected_port.name == "None":
+            self.error.emit("No port selected")
+            return False
+        if not self.client.is_service_connected():
+            self.error.emit(f"Acquisition service at {self.client.socket_path} is not running")
+            return False
+        # connected is emitted once the service reports the port open
+        self.client.request_connect(self.selected_port.name, self.selected_port.baudrate)
+        return True
+
+    def disconnect(self) -> None:
+        self.client.request_disconnect()
+
+    def kill_port(self) -> None:
+        self.disconnect()
+
+    def toggle_dtr_rts(self) -> None:
+        self.client.request_reset()
+
+    def send_data(self, data: bytearray) -> bool:
+        if not self.is_open():
+            self.error.emit("Cannot send data: Port is not open")
+            return False
+        self.client.request_send(bytes(data))
+        self.data_sent.emit(data)
+        return True
+
+    def _on_port_removed(self, port: SerialPortData) -> None:
+        pass    # The service watches its own port
+
+    def _on_service_port(self, status: bool) -> None:
+        if self.client.port_name:
+            self.selected_port = SerialPortData(name=self.client.port_name, baudrate=self.selected_port.baudrate)
+        self.connected_status = status
+        self.connected.emit(status)
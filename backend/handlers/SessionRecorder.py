@@ -0,0 +1,122 @@
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, QThread, QCoreApplication, Qt
+import time
+
+from backend.handlers.SerialPortHandler import SerialPortHandler
+from utils.SessionFile import SessionWriter
+
+class _SessionWriterWorker(QObject):
+    failed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.writer: SessionWriter | None = None
+
+    @pyqtSlot(str, float, float, float)
+    def open(self, path: str, wall_start: float, monotonic_start: float, index_interval: float) -> None:
+        self.close()
+        try:
+            self.writer = SessionWriter(path, wall_start, monotonic_start, index_interval)
+        except OSError as e:
+            self.failed.emit(f"Cannot record to {path}: {e}")
+
+    @pyqtSlot(float, bytes)
+    def write(self, timestamp: float, data: bytes) -> None:
+        if self.writer is None:
+            return
+        try:
+            self.writer.write(timestamp, data)
+        except OSError as e:
+            self.failed.emit(f"Recording stopped: {e}")
+            self.close()
+
+    @pyqtSlot()
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+class SessionRecorder(QObject):
+    """
+    Records the raw data received by a SerialPortHandler to a session file (see utils/SessionFile.py).
+    Chunks are timestamped with the handler's receive_time, the time.monotonic() at which its reader had them,
+    so the batching interval and GUI thread latency do not skew the timings. Chunks passed to record() directly
+    are stamped when record() is called. Writing is done by a background thread, stopped when the application
+    quits, so nothing is kept in memory and the GUI thread never waits on the disk.
+    """
+    recording_changed = pyqtSignal(bool)
+    error = pyqtSignal(str)
+
+    _worker_open = pyqtSignal(str, float, float, float)
+    _worker_write = pyqtSignal(float, bytes)
+    _worker_close = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.handler: SerialPortHandler | None = None
+        self.path: str | None = None
+        self.chunks = 0
+        self.bytes_recorded = 0
+        self._monotonic_start = 0.0
+
+        self.writer_thread = QThread()
+        self.writer_worker = _SessionWriterWorker()
+        self.writer_worker.moveToThread(self.writer_thread)
+        self._worker_open.connect(self.writer_worker.open)
+        self._worker_write.connect(self.writer_worker.write)
+        # Blocking, so the file is complete when stop() returns
+        self._worker_close.connect(self.writer_worker.close, Qt.ConnectionType.BlockingQueuedConnection)
+        self.writer_worker.failed.connect(self._on_failed)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        self.writer_thread.start()
+
+    def is_recording(self) -> bool:
+        return self.path is not None
+
+    def start(self, path: str, handler: SerialPortHandler | None = None, index_interval: float = 1.0) -> None:
+        """Start a new session file. With a handler, everything it receives is recorded, otherwise call record()"""
+        self.stop()
+        self.path = path
+        self.chunks = 0
+        self.bytes_recorded = 0
+        self._monotonic_start = time.monotonic()
+        self._worker_open.emit(path, time.time(), self._monotonic_start, float(index_interval))
+        if handler is not None:
+            self.handler = handler
+            handler.data_received.connect(self.record)
+        self.recording_changed.emit(True)
+
+    def record(self, data: bytes | bytearray) -> None:
+        if self.path is None or not data:
+            return
+        self.chunks += 1
+        self.bytes_recorded += len(data)
+        if self.handler is not None:
+            # Bytes buffered just before start() are stamped at the start of the session
+            timestamp = max(self.handler.receive_time, self._monotonic_start)
+        else:
+            timestamp = time.monotonic()
+        self._worker_write.emit(timestamp, bytes(data))
+
+    def stop(self) -> None:
+        if self.path is None:
+            return
+        if self.handler is not None:
+            self.handler.data_received.disconnect(self.record)
+            self.handler = None
+        self.path = None
+        self._worker_close.emit()
+        self.recording_changed.emit(False)
+
+    def shutdown(self) -> None:
+        if not self.writer_thread.isRunning():
+            return
+        self.stop()
+        self.writer_thread.quit()
+        self.writer_thread.wait()
+
+    def _on_failed(self, message: str) -> None:
+        self.error.emit(message)
+        self.stop()
@@ -1,37 +1,330 @@
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal
 from backend.handlers.SerialPortHandler import SerialPortHandler
-from dataclasses import dataclass, field
+from utils.ClockSync import ClockSync
+from utils.SerialFraming import BinaryFrameDecoder
+from utils.TelemetrySchema import TelemetrySchema, SchemaParser, Channel, register_schema, get_schema, parse_csv_lines
+from functools import lru_cache
+import numpy as np
+import time
+import typing
+
+IMU_FIELD_COUNT = 9
+IMU_COLUMNS = ('accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z', 'mag_x', 'mag_y', 'mag_z')
+
+# Default binary IMU frame: sync word, 9 x float32 (accel, gyro, mag) and a uint32 device timestamp, little endian
+IMU_FRAME_SYNC = b'\xaa\x55'
+IMU_FRAME_DTYPE = np.dtype([('values', '<f4', (IMU_FIELD_COUNT,)), ('timestamp', '<u4')])
+
+# The same formats as schemas, see utils/TelemetrySchema.py
+IMU_CSV_SCHEMA = register_schema(TelemetrySchema('imu9_csv', IMU_COLUMNS))
+IMU_BINARY_SCHEMA = register_schema(TelemetrySchema(
+    'imu9_binary', IMU_COLUMNS + (Channel('timestamp', '<u4', 'us'),),
+    framing='binary', sync=IMU_FRAME_SYNC, timestamp='timestamp'))
 
-@dataclass
 class Vector3D:
-    x: float = field(default=0.0)
-    y: float = field(default=0.0)
-    z: float = field(default=0.0)
+    """x, y, z over three floats, either its own or a view into a larger array"""
+    __slots__ = ('values',)
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.values = np.array((x, y, z), dtype=np.float64)
+
+    @classmethod
+    def view(cls, values: np.ndarray) -> 'Vector3D':
+        vector = cls.__new__(cls)
+        vector.values = values
+        return vector
+
+    @property
+    def x(self) -> float:
+        return float(self.values[0])
+
+    @x.setter
+    def x(self, value: float):
+        self.values[0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.values[1])
+
+    @y.setter
+    def y(self, value: float):
+        self.values[1] = value
+
+    @property
+    def z(self) -> float:
+        return float(self.values[2])
+
+    @z.setter
+    def z(self, value: float):
+        self.values[2] = value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Vector3D) and bool(np.array_equal(self.values, other.values))
+
+    def __repr__(self) -> str:
+        return f"Vector3D(x={self.x}, y={self.y}, z={self.z})"
 
-@dataclass
 class IMUData:
-    accel: Vector3D
-    gyro: Vector3D
-    mag: Vector3D
+    """
+    One IMU sample, a view of 9 values (accel, gyro, mag) that is usually a row of a TelemetryBlock.
+    The Vector3D parts are created on access and write through to the row.
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, accel: Vector3D, gyro: Vector3D, mag: Vector3D):
+        self.values = np.concatenate((accel.values, gyro.values, mag.values))
+
+    @classmethod
+    def from_values(cls, values) -> 'IMUData':
+        """View of values without copying when it is already a float64 array"""
+        sample = cls.__new__(cls)
+        sample.values = np.asarray(values, dtype=np.float64)
+        return sample
+
+    @property
+    def accel(self) -> Vector3D:
+        return Vector3D.view(self.values[0:3])
+
+    @accel.setter
+    def accel(self, vector: Vector3D):
+        self.values[0:3] = vector.values
+
+    @property
+    def gyro(self) -> Vector3D:
+        return Vector3D.view(self.values[3:6])
+
+    @gyro.setter
+    def gyro(self, vector: Vector3D):
+        self.values[3:6] = vector.values
+
+    @property
+    def mag(self) -> Vector3D:
+        return Vector3D.view(self.values[6:9])
+
+    @mag.setter
+    def mag(self, vector: Vector3D):
+        self.values[6:9] = vector.values
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IMUData) and bool(np.array_equal(self.values, other.values))
+
+    def __repr__(self) -> str:
+        return f"IMUData(accel={self.accel}, gyro={self.gyro}, mag={self.mag})"
+
+@lru_cache(maxsize=64)
+def _column_index(columns: typing.Tuple[str, ...]) -> typing.Dict[str, int]:
+    return {name: i for i, name in enumerate(columns)}
+
+class TelemetryBlock:
+    """
+    Many samples of named channels in one contiguous (samples, channels) float64 array.
+    block['accel_x'] is a column view, block.channels('accel_x', 'accel_y', 'accel_z') a (samples, 3) array
+    (a view when the columns are adjacent) and block.sample(i) an IMUData view of a row. Any other index goes
+    to the array, so block[:, 0:3] and np.asarray(block) work as they did when blocks were plain arrays.
+    timestamps holds the time.monotonic() time of every sample when the device sends its own clock, else None.
+    """
+    __slots__ = ('data', 'columns', 'timestamps', '_index')
+
+    def __init__(self, data, columns: typing.Sequence[str] = IMU_COLUMNS, timestamps: np.ndarray | None = None):
+        self.columns = tuple(columns)
+        self.data = np.ascontiguousarray(data, dtype=np.float64).reshape(-1, len(self.columns))
+        self.timestamps = timestamps
+        self._index = _column_index(self.columns)
+
+    @property
+    def shape(self) -> typing.Tuple[int, int]:
+        return self.data.shape
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return self.data.astype(dtype or self.data.dtype)
+        if dtype is None or np.dtype(dtype) == self.data.dtype:
+            return self.data
+        if copy is False:
+            raise ValueError(f"A {np.dtype(dtype)} array of a float64 TelemetryBlock needs a copy, copy=False forbids it")
+        return self.data.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[:, self.column_index(key)]
+        return self.data[key]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def column_index(self, name: str) -> int:
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f"No column {name!r}, the block has {', '.join(self.columns)}") from None
+
+    def channels(self, *names: str) -> np.ndarray:
+        """(samples, len(names)) values of the named columns"""
+        indices = [self.column_index(name) for name in names]
+        first = indices[0]
+        if indices == list(range(first, first + len(indices))):
+            return self.data[:, first:first + len(indices)]
+        return self.data[:, indices]
+
+    def sample(self, i: int) -> IMUData:
+        return IMUData.from_values(self.data[i])
+
+    def samples(self) -> typing.Iterator[IMUData]:
+        """IMUData views of every row, for per-sample consumers"""
+        for row in self.data:
+            yield IMUData.from_values(row)
+
+    def __repr__(self) -> str:
+        return f"TelemetryBlock({len(self)} samples, columns={self.columns})"
+
+class BlockClock:
+    """
+    time.monotonic() timestamps of the samples of consecutive blocks: the device clock when the block carries one,
+    else the samples of a batch are spread over the time since the previous block instead of stacking on one time.
+    One per stream, reset() when it restarts (e.g. on reconnect)
+    """
+    def __init__(self) -> None:
+        self.last_block_time: float | None = None
+
+    def reset(self) -> None:
+        self.last_block_time = None
+
+    def timestamps(self, block: TelemetryBlock) -> np.ndarray:
+        now = time.monotonic()
+        start = self.last_block_time if self.last_block_time is not None else now
+        self.last_block_time = now
+        if block.timestamps is not None:
+            return block.timestamps
+        return np.linspace(start, now, len(block) + 1)[1:]
 
 class TelemetryHandler(QObject):
     on_data = pyqtSignal(IMUData)
+    on_block = pyqtSignal(object)   # TelemetryBlock of IMU_COLUMNS (or of the schema columns), batch mode and binary frames
+    on_frames = pyqtSignal(object)  # Structured np.ndarray of the binary frame dtype or record dtype of the schema
     on_error = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, batch: bool = False):
+        """If batch is True, handle_serial_data parses every complete line of a chunk at once and emits on_block"""
         super().__init__()
+        self.batch = bool(batch)
+        self.malformed_lines = 0        # Lines skipped by the batch parser
+        self._partial_line = bytearray()
+        self.frame_decoder: BinaryFrameDecoder | None = None
+        self.clock: ClockSync | None = None
+        self.parser: SchemaParser | None = None
+
+    def set_binary_format(self, dtype: np.dtype = IMU_FRAME_DTYPE, sync: bytes = IMU_FRAME_SYNC):
+        """Decode incoming data as binary frames. If the dtype has a 'values' field it is also emitted through on_block"""
+        self.parser = None
+        self.frame_decoder = BinaryFrameDecoder(dtype, sync)
+
+    def set_csv_format(self):
+        """Decode incoming data as CSV lines (the default)"""
+        self.parser = None
+        self.frame_decoder = None
+        self._partial_line.clear()
+
+    def set_schema(self, schema: TelemetrySchema | str):
+        """
+        Decode incoming data with a schema, or the name of a registered one. Blocks carry the schema columns,
+        and the device clock when the schema has a timestamp channel. on_data is only emitted for IMU_COLUMNS.
+        """
+        schema = get_schema(schema) if isinstance(schema, str) else schema
+        self.frame_decoder = None
+        self._partial_line.clear()
+        self.parser = SchemaParser(schema)
+        self.clock = ClockSync(schema.tick_seconds, schema.wrap) if schema.timestamp is not None else None
+
+    def set_device_clock(self, tick_seconds: float | None = 1e-6, wrap: int | None = 1 << 32):
+        """
+        Timestamp blocks with the device clock instead of their arrival: the 'timestamp' field of binary frames,
+        or a 10th CSV value after the 9 IMU values. tick_seconds is the counter period (1 / rate for a sample
+        counter), None goes back to arrival times. See utils/ClockSync.py for the mapping to host time.
+        A schema names its own timestamp channel, this replaces its tick_seconds and wrap.
+        """
+        self.clock = ClockSync(tick_seconds, wrap) if tick_seconds is not None else None
+        self._partial_line.clear()
 
     def handle_serial_data(self, data: bytearray):
+        if self.parser is not None:
+            self.handle_schema_data(data)
+            return
+        if self.frame_decoder is not None:
+            self.handle_binary_frames(data)
+            return
+        if self.batch:
+            self.handle_serial_batch(data)
+            return
         try:
             # Assuming the data format is "accel_x,accel_y,accel_z,gyro_x,gyro_y,gyro_z,mag_x,mag_y,mag_z"
             decoded_data = data.decode('utf-8').strip()
-            values = list(map(float, decoded_data.split(',')))
-            if len(values) == 9:
-                imu_data = IMUData(
-                    accel=Vector3D(values[0], values[1], values[2]),
-                    gyro=Vector3D(values[3], values[4], values[5]),
-                    mag=Vector3D(values[6], values[7], values[8])
-                )
-                self.on_data.emit(imu_data)
+            values = np.fromiter(map(float, decoded_data.split(',')), dtype=np.float64)
+            if values.size == self._csv_field_count():
+                self.on_data.emit(IMUData.from_values(values[:IMU_FIELD_COUNT]))
         except Exception as e:
-            self.on_error.emit(f"Error processing telemetry data: {e}")
\ No newline at end of file
+            self.on_error.emit(f"Error processing telemetry data: {e}")
+
+    def handle_serial_batch(self, data: bytearray):
+        """Parse all newline-terminated records of a chunk, keeping an incomplete last line for the next chunk"""
+        self._partial_line.extend(data)
+        end = self._partial_line.rfind(b'\n')
+        if end < 0:
+            return
+        chunk = bytes(self._partial_line[:end])
+        del self._partial_line[:end + 1]
+
+        values = self.parse_csv_block(chunk)
+        if values.shape[0] == 0:
+            return
+        if self.clock is None:
+            self._emit_block(TelemetryBlock(values))
+            return
+        timestamps = self.clock.map(values[:, IMU_FIELD_COUNT], time.monotonic())
+        self._emit_block(TelemetryBlock(values[:, :IMU_FIELD_COUNT], timestamps=timestamps))
+
+    def handle_binary_frames(self, data: bytearray):
+        if self.frame_decoder is None:
+            raise ValueError("Binary format is not set")
+        records = self.frame_decoder.decode(data)
+        if records.shape[0] == 0:
+            return
+        self.on_frames.emit(records)
+        if records.dtype.names is None or 'values' not in records.dtype.names:
+            return
+        timestamps = None
+        if self.clock is not None and 'timestamp' in records.dtype.names:
+            timestamps = self.clock.map(records['timestamp'], time.monotonic())
+        self._emit_block(TelemetryBlock(records['values'], timestamps=timestamps))
+
+    def handle_schema_data(self, data: bytearray):
+        if self.parser is None:
+            raise ValueError("Schema is not set")
+        parsed = self.parser.feed(data)
+        self.malformed_lines += parsed.malformed
+        if parsed.values.shape[0] == 0:
+            return
+        if parsed.records is not None:
+            self.on_frames.emit(parsed.records)
+        timestamps = None
+        if self.clock is not None and parsed.ticks is not None:
+            timestamps = self.clock.map(parsed.ticks, time.monotonic())
+        self._emit_block(TelemetryBlock(parsed.values, self.parser.schema.columns, timestamps))
+
+    def _emit_block(self, block: TelemetryBlock):
+        self.on_block.emit(block)
+        if block.columns == IMU_COLUMNS and self.receivers(self.on_data) > 0:
+            # Per-sample compatibility path, only paid for when someone listens
+            for sample in block.samples():
+                self.on_data.emit(sample)
+
+    def parse_csv_block(self, chunk: bytes) -> np.ndarray:
+        """Parse newline-delimited CSV records into a (records, fields) float array, counting and skipping malformed lines"""
+        values, malformed = parse_csv_lines(chunk, self._csv_field_count())
+        self.malformed_lines += malformed
+        return values
+
+    def _csv_field_count(self) -> int:
+        return IMU_FIELD_COUNT + (1 if self.clock is not None else 0)
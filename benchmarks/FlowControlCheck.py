@@ -0,0 +1,81 @@
+"""
+Regression check of XON/XOFF write flow control on a pty, with the handler in both reader modes:
+
+    VirtualSerialDevice sends XOFF -> SerialPortHandler.send_data(b'hello') -> nothing may arrive
+    VirtualSerialDevice sends XON  -> b'hello' arrives, once
+
+Exits non-zero if a mode writes while paused or does not resume.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.FlowControlCheck
+"""
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.SerialWriteQueue import XON, XOFF
+from utils.VirtualSerialDevice import VirtualSerialDevice
+
+MESSAGE = b'hello'
+
+
+def _spin(seconds: float) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def run_once(threaded: bool, settle: float) -> list:
+    """Problems found with this reader mode, empty if flow control works"""
+    device = VirtualSerialDevice(rate_hz=0)
+    serial = SerialPortHandler(threaded=threaded)
+    serial.set_reset_timing(0)      # ptys have no modem lines
+    serial.set_wait_time(10)
+    serial.set_write_pacing(flow_control='xonxoff')
+    serial.selected_port = SerialPortData(name=device.port_name, baudrate=115200)
+    if not serial.connect():
+        device.close()
+        return [f"cannot open {device.port_name}"]
+    device.start()
+
+    problems = []
+    device.send(bytes([XOFF]))
+    _spin(settle)
+    serial.send_data(bytearray(MESSAGE))
+    _spin(settle)
+    if device.received:
+        problems.append(f"wrote {bytes(device.received)!r} after XOFF")
+    device.send(bytes([XON]))
+    _spin(settle)
+    if bytes(device.received) != MESSAGE:
+        problems.append(f"received {bytes(device.received)!r} after XON, expected {MESSAGE!r}")
+
+    serial.shutdown()
+    device.close()
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settle', type=float, default=0.3, help="Seconds given to each step to reach the other side")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    failed = False
+    for threaded in (False, True):
+        mode = 'threaded' if threaded else 'non-threaded'
+        problems = run_once(threaded, args.settle)
+        print(f"{mode:<13} {'FAIL: ' + '; '.join(problems) if problems else 'ok'}", flush=True)
+        failed = failed or bool(problems)
+    app.aboutToQuit.emit()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
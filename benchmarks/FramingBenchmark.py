@@ -0,0 +1,94 @@
+"""
+Frames/s of the receive-side framers, without a port:
+
+    filters     SerialFramer with two SerialPacketFilters, '$'..'\\n' and '#'..';' frames interleaved
+    cobs, slip  FrameDecoder of utils/SerialFraming.py, optionally with a CRC
+
+The stream is fed in chunks of --chunk bytes (about what one serial read returns at 1 Mbaud), so frames
+are split across chunks. Every frame must come out, in order, or the benchmark exits non-zero.
+
+Run from the repository root:
+    python -m benchmarks.FramingBenchmark --frames 200000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from backend.handlers.SerialPortHandler import SerialFramer, SerialPacketFilter
+from utils.SerialFraming import FrameDecoder, encode_frame
+
+
+def make_payloads(frames: int, size: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    digits = rng.integers(ord('0'), ord('9') + 1, size=(frames, size), dtype=np.uint8)
+    return [row.tobytes() for row in digits]
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def run_filters(payloads: list, chunk: int) -> tuple:
+    """(payloads in arrival order, seconds)"""
+    dollar = SerialPacketFilter(b'$', b'\n')
+    hash_ = SerialPacketFilter(b'#', b';')
+    framer = SerialFramer([dollar, hash_])
+    stream = b''.join((b'$' + p + b'\n') if i % 2 == 0 else (b'#' + p + b';') for i, p in enumerate(payloads))
+    received = {dollar: [], hash_: []}
+    dollar.received_batch.connect(lambda batch: received[dollar].extend(bytes(p) for p in batch))
+    hash_.received_batch.connect(lambda batch: received[hash_].extend(bytes(p) for p in batch))
+    feed = chunked(stream, chunk)
+    start = time.perf_counter()
+    for data in feed:
+        framer.feed(data)
+    seconds = time.perf_counter() - start
+    # Put the two filters' frames back in stream order to compare them with what was sent
+    ordered = [None] * (len(received[dollar]) + len(received[hash_]))
+    if len(ordered[0::2]) != len(received[dollar]):
+        return received[dollar] + received[hash_], seconds    # Frames were lost, the comparison fails anyway
+    ordered[0::2] = received[dollar]
+    ordered[1::2] = received[hash_]
+    return ordered, seconds
+
+
+def run_decoder(payloads: list, chunk: int, mode: str, crc: str | None) -> tuple:
+    decoder = FrameDecoder(mode, crc)
+    # A COBS frame is only trusted after a delimiter, send one first like a device does when it starts
+    lead = b'\x00' if mode == 'cobs' else b''
+    feed = chunked(lead + b''.join(encode_frame(p, mode, crc) for p in payloads), chunk)
+    received = []
+    start = time.perf_counter()
+    for data in feed:
+        received.extend(decoder.feed(data))
+    return received, time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=200000)
+    parser.add_argument('--size', type=int, default=40, help="Payload bytes per frame")
+    parser.add_argument('--chunk', type=int, default=1300, help="Bytes per feed call")
+    parser.add_argument('--modes', default='filters,cobs,slip', help="Comma separated: filters, cobs, slip")
+    parser.add_argument('--crc', default=None, help="CRC of the cobs/slip frames: crc16, crc32")
+    args = parser.parse_args(argv)
+
+    payloads = make_payloads(args.frames, args.size)
+    print(f"{'mode':<8} {'frames':>8} {'seconds':>8} {'frames/s':>10}")
+    failed = False
+    for mode in args.modes.split(','):
+        if mode == 'filters':
+            received, seconds = run_filters(payloads, args.chunk)
+        else:
+            received, seconds = run_decoder(payloads, args.chunk, mode, args.crc)
+        ok = received == payloads
+        failed = failed or not ok
+        print(f"{mode:<8} {len(received):>8d} {seconds:>8.3f} {len(received) / seconds:>10.0f}"
+              f"{'' if ok else '  FAIL: frames lost or out of order'}", flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Microbenchmark of appending to a full live plot buffer, per append call:
+
+    ring buffer     utils/SampleRingBuffer.append, what LiveMultiPlotWidget and LivePlotWidget use
+    concatenate     np.concatenate of the new samples, then slicing to the buffer size (the previous widget code)
+
+Both hold one x row and --lines y rows and start full, so every append also drops the oldest samples.
+
+Run from the repository root:
+    python -m benchmarks.PlotAppendBenchmark --capacities 2000,20000,200000,1000000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from utils.SampleRingBuffer import SampleRingBuffer
+
+
+class ConcatenateBuffer:
+    """The append path the plot widgets had before SampleRingBuffer"""
+    def __init__(self, line_count: int, capacity: int) -> None:
+        self.capacity = capacity
+        self.x = np.array([], dtype=float)
+        self.ys = np.empty((line_count, 0), dtype=float)
+
+    def append(self, x: np.ndarray, ys: np.ndarray) -> None:
+        self.x = np.concatenate((self.x, x))
+        self.ys = np.concatenate((self.ys, ys), axis=1)
+        if self.x.size > self.capacity:
+            self.x = self.x[-self.capacity:]
+            self.ys = self.ys[:, -self.capacity:]
+
+
+def time_appends(buffer, line_count: int, capacity: int, block: int, min_seconds: float) -> float:
+    """Seconds per append of block samples into a full buffer"""
+    x = np.arange(capacity, dtype=float)
+    buffer.append(x, np.zeros((line_count, capacity)))
+    new_x = np.arange(block, dtype=float)
+    new_ys = np.ones((line_count, block))
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        buffer.append(new_x, new_ys)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds and calls >= 10:
+            return elapsed / calls
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--capacities', default='2000,20000,200000,1000000', help="Comma separated buffer sizes")
+    parser.add_argument('--lines', type=int, default=3, help="y rows per sample")
+    parser.add_argument('--block', type=int, default=1, help="Samples per append")
+    parser.add_argument('--seconds', type=float, default=0.5, help="Minimum time measured per case")
+    args = parser.parse_args(argv)
+
+    print(f"{'capacity':>9} {'ring buffer':>12} {'concatenate':>12}")
+    for capacity in (int(c) for c in args.capacities.split(',')):
+        ring = time_appends(SampleRingBuffer(args.lines, capacity=capacity), args.lines, capacity, args.block, args.seconds)
+        concat = time_appends(ConcatenateBuffer(args.lines, capacity), args.lines, capacity, args.block, args.seconds)
+        print(f"{capacity:>9d} {ring * 1e6:>9.1f} us {concat * 1e6:>9.1f} us", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+End-to-end benchmark of the acquisition path without hardware:
+
+    VirtualSerialDevice (pty) -> SerialPortHandler (threaded) -> TelemetryHandler -> LiveMultiPlotWidget
+
+The device streams at rising rates; every run reports the sustained samples/s that reached the plot,
+the latency from the device write to the plot append (percentiles), and the samples lost on the way.
+The ramp of a format stops at the first rate that is not sustained.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.SerialPipelineBenchmark --formats csv,binary
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.TelemetryHandler import TelemetryHandler, TelemetryBlock, IMU_FRAME_DTYPE, IMU_FRAME_SYNC
+from frontend.widgets.LiveMultiPlotWidget import LiveMultiPlotWidget
+from utils.SyntheticTelemetry import encode_csv, binary_encoder
+from utils.VirtualSerialDevice import VirtualSerialDevice, SEQUENCE_CHANNEL
+
+DEFAULT_RATES = (1000, 5000, 20000, 50000, 100000, 200000, 400000)
+SUSTAINED_RATIO = 0.95   # A rate is sustained if this fraction of the offered samples arrived, with no drops
+
+
+@dataclass
+class BenchmarkResult:
+    format: str
+    offered: float          # Samples per second sent by the device
+    sustained: float        # Samples per second appended to the plot during the measurement window
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    dropped: int            # Samples lost: not written by the device, dropped by the handler or never delivered
+    malformed: int          # CSV lines or binary resyncs skipped by the parser
+    plot_fps: float
+
+    @property
+    def ok(self) -> bool:
+        return self.sustained >= SUSTAINED_RATIO * self.offered and self.dropped == 0
+
+
+def _spin(seconds: float) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def run_once(fmt: str, rate: float, duration: float, warmup: float) -> BenchmarkResult:
+    encode = encode_csv if fmt == 'csv' else binary_encoder(IMU_FRAME_DTYPE, IMU_FRAME_SYNC)
+    device = VirtualSerialDevice(rate, encode)
+
+    serial = SerialPortHandler(threaded=True)
+    serial.set_reset_timing(0)      # ptys have no modem lines
+    serial.set_wait_time(10)
+    serial.selected_port = SerialPortData(name=device.port_name, baudrate=1000000)
+    telemetry = TelemetryHandler(batch=True)
+    if fmt != 'csv':
+        telemetry.set_binary_format()
+    plot = LiveMultiPlotWidget(line_count=3, buffer_size=int(rate * 10), target_fps=60)
+    plot.resize(1000, 500)
+    plot.show()
+
+    received = []
+    latencies = []
+    window = {'start': None, 'samples': 0}
+
+    def on_block(block: TelemetryBlock) -> None:
+        sequence = block.data[:, SEQUENCE_CHANNEL].astype(np.int64)
+        plot.append_samples(sequence / rate, block.channels('accel_x', 'accel_y', 'accel_z').T)
+        now = time.monotonic()
+        received.append(sequence)
+        if window['start'] is not None:
+            window['samples'] += sequence.size
+            latencies.append(now - device.send_time(sequence))
+
+    serial.data_received.connect(telemetry.handle_serial_data)
+    telemetry.on_block.connect(on_block)
+    if not serial.connect():
+        raise RuntimeError(f"Cannot open {device.port_name}")
+    device.start()
+
+    _spin(warmup)
+    window['start'] = time.monotonic()
+    _spin(duration)
+    elapsed = time.monotonic() - window['start']
+    sustained = window['samples'] / elapsed
+    window['start'] = None
+    fps = plot.achieved_fps
+
+    device.stop()
+    _spin(0.5)  # Drain what is still in flight
+    serial.shutdown()
+
+    sequence = np.concatenate(received) if received else np.empty(0, dtype=np.int64)
+    delivered = np.unique(sequence).size
+    # Whatever the device wrote and never reached the plot was lost on the way
+    dropped = device.dropped_samples + max(0, device.sent_samples - delivered)
+    lat = np.concatenate(latencies) * 1000.0 if latencies else np.array([np.nan])
+    malformed = telemetry.malformed_lines + (telemetry.frame_decoder.resyncs if telemetry.frame_decoder else 0)
+    plot.close()
+    plot.deleteLater()
+    device.close()
+    return BenchmarkResult(fmt, rate, sustained, *np.nanpercentile(lat, [50, 95, 99]), dropped, malformed, fps)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--formats', default='csv,binary', help="Comma separated: csv, binary")
+    parser.add_argument('--rates', default=','.join(map(str, DEFAULT_RATES)), help="Comma separated samples/s, tried in order")
+    parser.add_argument('--duration', type=float, default=3.0, help="Measured seconds per rate")
+    parser.add_argument('--warmup', type=float, default=0.5, help="Seconds ignored at the start of each rate")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    header = f"{'format':<7} {'offered/s':>10} {'sustained/s':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'dropped':>8} {'malformed':>9} {'fps':>5}"
+    print(header)
+    best = {}
+    for fmt in args.formats.split(','):
+        for rate in (float(r) for r in args.rates.split(',')):
+            r = run_once(fmt, rate, args.duration, args.warmup)
+            print(f"{r.format:<7} {r.offered:>10.0f} {r.sustained:>12.0f} {r.latency_p50_ms:>8.1f} {r.latency_p95_ms:>8.1f} "
+                  f"{r.latency_p99_ms:>8.1f} {r.dropped:>8d} {r.malformed:>9d} {r.plot_fps:>5.0f}", flush=True)
+            if not r.ok:
+                break
+            best[fmt] = r.offered
+    for fmt in args.formats.split(','):
+        print(f"{fmt}: max sustained rate {best.get(fmt, 0):.0f} samples/s")
+    app.aboutToQuit.emit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
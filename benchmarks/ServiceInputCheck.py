@@ -0,0 +1,145 @@
+"""
+Check that malformed local socket messages cannot take down either end of the acquisition service:
+
+    service   service.py on a VirtualSerialDevice gets a raw client sending broken JSON, a JSON array,
+              invalid UTF-8, a non-numeric baudrate and non-base64 send data. Each must be answered with a
+              STATUS error, the service must keep running and an AcquisitionClient must still get blocks.
+    client    an AcquisitionClient gets an INFO without columns, a JSON array and a truncated block from a
+              fake service. Each must end in on_error and a dropped socket, never in an exception in a slot.
+
+Exits non-zero on any failure. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.ServiceInputCheck
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from backend.handlers.AcquisitionClient import AcquisitionClient
+from utils.BlockStream import (MessageDecoder, decode_json, encode_json, encode_message,
+                               MSG_HELLO, MSG_INFO, MSG_BLOCK, MSG_STATUS, MSG_COMMAND)
+from utils.VirtualSerialDevice import VirtualSerialDevice
+
+BAD_COMMANDS = [
+    encode_message(MSG_COMMAND, b'{not json'),
+    encode_message(MSG_COMMAND, b'[]'),
+    encode_message(MSG_COMMAND, b'\xff\xfe'),
+    encode_json(MSG_COMMAND, {'command': 'connect', 'port': '/dev/null', 'baudrate': 'fast'}),
+    encode_json(MSG_COMMAND, {'command': 'send', 'data': 123}),
+]
+
+BAD_SERVICE_MESSAGES = [
+    encode_json(MSG_INFO, {'port': '', 'connected': False}),
+    encode_message(MSG_STATUS, b'[]'),
+    encode_message(MSG_BLOCK, b'\x00\x01'),
+]
+
+
+def _spin_until(condition, timeout_s: float) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        loop = QEventLoop()
+        QTimer.singleShot(20, loop.quit)
+        loop.exec()
+    return condition()
+
+
+def _connect(socket: QLocalSocket, socket_path: str, timeout_s: float) -> bool:
+    """Retry until the service listens"""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        socket.connectToServer(socket_path)
+        if socket.waitForConnected(100):
+            return True
+        socket.abort()
+        time.sleep(0.05)
+    return False
+
+
+def check_service(socket_path: str) -> list:
+    problems = []
+    device = VirtualSerialDevice(1000)
+    service = subprocess.Popen([sys.executable, 'service.py', '--socket', socket_path, '--port', device.port_name,
+                                '--reset-pulse', '0'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    device.start()
+    raw = QLocalSocket()
+    errors = []
+    decoder = MessageDecoder()
+
+    def on_ready_read() -> None:
+        for kind, payload in decoder.feed(raw.readAll().data()):
+            if kind == MSG_STATUS and 'error' in decode_json(payload):
+                errors.append(decode_json(payload)['error'])
+
+    raw.readyRead.connect(on_ready_read)
+    if not _connect(raw, socket_path, 5.0):
+        problems.append("service did not start listening")
+    else:
+        raw.write(encode_json(MSG_HELLO, {'role': 'viewer', 'name': 'raw'}))
+        for message in BAD_COMMANDS:
+            raw.write(message)
+        _spin_until(lambda: len(errors) >= len(BAD_COMMANDS) or service.poll() is not None, 3.0)
+        if service.poll() is not None:
+            problems.append(f"service exited with code {service.returncode} on malformed commands")
+        elif len(errors) != len(BAD_COMMANDS):
+            problems.append(f"{len(errors)} of {len(BAD_COMMANDS)} malformed commands answered with an error")
+
+        client = AcquisitionClient(socket_path, name='check')
+        samples = [0]
+        client.on_block.connect(lambda block: samples.__setitem__(0, samples[0] + len(block)))
+        client.open()
+        if service.poll() is None and not _spin_until(lambda: samples[0] > 0, 5.0):
+            problems.append("no blocks reached a client after the malformed commands")
+        client.close()
+    raw.abort()
+
+    service.terminate()
+    service.wait(5)
+    device.close()
+    return problems
+
+
+def check_client(socket_path: str) -> list:
+    problems = []
+    for message in BAD_SERVICE_MESSAGES:
+        server = QLocalServer()
+        QLocalServer.removeServer(socket_path)
+        server.listen(socket_path)
+        server.newConnection.connect(lambda server=server, message=message: server.nextPendingConnection().write(message))
+        client = AcquisitionClient(socket_path, name='check')
+        errors = []
+        client.on_error.connect(errors.append)
+        client.open()
+        if not _spin_until(lambda: bool(errors), 3.0):
+            problems.append(f"no on_error for service message {message!r}")
+        client.close()
+        server.close()
+    return problems
+
+
+def main(argv=None) -> int:
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    exceptions = []
+    # PyQt aborts on an exception in a slot unless an excepthook is installed, record them instead
+    sys.excepthook = lambda kind, value, traceback: exceptions.append(f"{kind.__name__}: {value}")
+
+    socket_path = os.path.join(tempfile.mkdtemp(), 'check.sock')
+    results = [('service', check_service(socket_path)), ('client', check_client(socket_path))]
+    failed = bool(exceptions)
+    for name, problems in results:
+        failed = failed or bool(problems)
+        print(f"{name:<8} {'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+    if exceptions:
+        print('FAIL: exceptions in slots: ' + '; '.join(exceptions))
+    sys.stdout.flush()
+    app.aboutToQuit.emit()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
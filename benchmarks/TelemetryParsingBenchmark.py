@@ -0,0 +1,73 @@
+"""
+Records/s of TelemetryHandler CSV parsing, without a port:
+
+    per-line   handle_serial_data(batch=False) fed one line at a time, on_data per record
+    batch      handle_serial_data(batch=True) fed chunks of --chunk bytes, on_block per chunk
+    schema     the same chunks through set_schema('imu9_csv')
+
+Records are random 9-field lines; a few malformed ones can be mixed in with --malformed.
+
+Run from the repository root:
+    python -m benchmarks.TelemetryParsingBenchmark --records 100000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from PyQt6.QtCore import QCoreApplication
+
+from backend.handlers.TelemetryHandler import TelemetryHandler, IMU_FIELD_COUNT
+
+
+def make_lines(records: int, malformed: float, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-100, 100, size=(records, IMU_FIELD_COUNT))
+    lines = [','.join(f'{v:.4f}' for v in row).encode('ascii') + b'\n' for row in values]
+    for i in rng.choice(records, size=int(records * malformed), replace=False):
+        lines[i] = b'1.0,2.0,oops\n'
+    return lines
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def run(mode: str, lines: list, chunk: int) -> tuple:
+    """(records parsed, seconds)"""
+    telemetry = TelemetryHandler(batch=mode != 'per-line')
+    if mode == 'schema':
+        telemetry.set_schema('imu9_csv')
+    parsed = [0]
+    if mode == 'per-line':
+        telemetry.on_data.connect(lambda sample: parsed.__setitem__(0, parsed[0] + 1))
+        feed = [bytearray(line) for line in lines]
+    else:
+        telemetry.on_block.connect(lambda block: parsed.__setitem__(0, parsed[0] + len(block)))
+        feed = [bytearray(part) for part in chunked(b''.join(lines), chunk)]
+    start = time.perf_counter()
+    for data in feed:
+        telemetry.handle_serial_data(data)
+    return parsed[0], time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--chunk', type=int, default=10000, help="Bytes per handle_serial_data call in the batch modes")
+    parser.add_argument('--malformed', type=float, default=0.0, help="Fraction of malformed lines")
+    parser.add_argument('--modes', default='per-line,batch,schema', help="Comma separated: per-line, batch, schema")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    lines = make_lines(args.records, args.malformed)
+    print(f"{'mode':<9} {'records':>8} {'seconds':>8} {'records/s':>10}")
+    for mode in args.modes.split(','):
+        parsed, seconds = run(mode, lines, args.chunk)
+        print(f"{mode:<9} {parsed:>8d} {seconds:>8.3f} {parsed / seconds:>10.0f}", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
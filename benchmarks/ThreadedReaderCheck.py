@@ -0,0 +1,109 @@
+"""
+Headless zero-loss check of the threaded reader while the GUI thread is blocked:
+
+    VirtualSerialDevice (pty) -> SerialPortHandler(threaded=True) -> data_received
+
+The device streams one numbered line per sample, so the bytes it sent can be rebuilt exactly. Meanwhile the
+GUI thread sleeps block_ms every interval_ms, far longer than the pty buffer lasts at this rate.
+Every received byte is compared with what was sent; the check exits non-zero on any dropped,
+corrupted or reordered byte, or on samples the device could not write because the host stopped reading.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.ThreadedReaderCheck
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from utils.VirtualSerialDevice import VirtualSerialDevice, SEQUENCE_CHANNEL
+
+PADDING = 'x' * 52  # Line length of a CSV IMU sample
+
+
+def encode_numbered(values: np.ndarray, timestamps: np.ndarray) -> bytes:
+    """One 'sequence,padding' line per sample, the same bytes however the samples are split in chunks"""
+    return b''.join(_line(int(seq)) for seq in values[:, SEQUENCE_CHANNEL])
+
+
+def _line(sequence: int) -> bytes:
+    return f'{sequence:010d},{PADDING}\n'.encode('ascii')
+
+
+def _spin(seconds: float) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def _first_difference(a: bytes, b: bytes) -> int:
+    size = min(len(a), len(b))
+    diff = np.flatnonzero(np.frombuffer(a[:size], dtype=np.uint8) != np.frombuffer(b[:size], dtype=np.uint8))
+    return int(diff[0]) if diff.size else size
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=20000, help="Samples per second sent by the device")
+    parser.add_argument('--duration', type=float, default=3.0, help="Seconds of streaming")
+    parser.add_argument('--block-ms', type=int, default=300, help="How long the GUI thread sleeps each time")
+    parser.add_argument('--interval-ms', type=int, default=50, help="Event loop time between two sleeps")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    device = VirtualSerialDevice(args.rate, encode_numbered)
+    serial = SerialPortHandler(threaded=True)
+    serial.set_reset_timing(0)      # ptys have no modem lines
+    serial.set_wait_time(10)
+    serial.selected_port = SerialPortData(name=device.port_name, baudrate=1000000)
+    received = bytearray()
+    serial.data_received.connect(received.extend)
+    if not serial.connect():
+        print(f"FAIL: cannot open {device.port_name}")
+        device.close()
+        return 1
+
+    blocked = {'ms': 0}
+
+    def block_gui() -> None:
+        time.sleep(args.block_ms / 1000.0)
+        blocked['ms'] += args.block_ms
+
+    blocker = QTimer()
+    blocker.timeout.connect(block_gui)
+    blocker.start(args.interval_ms)
+    device.start()
+    start = time.monotonic()
+    _spin(args.duration)
+    device.stop()
+    elapsed = time.monotonic() - start
+    blocker.stop()
+    _spin(0.5)  # Drain what is still in flight
+    serial.shutdown()
+
+    expected = b''.join(_line(seq) for seq in range(device.sent_samples))
+    problems = []
+    if device.dropped_samples:
+        problems.append(f"{device.dropped_samples} samples not written, the pty was full")
+    if serial.dropped_bytes:
+        problems.append(f"{serial.dropped_bytes} bytes dropped by the receive buffer")
+    if bytes(received) != expected:
+        problems.append(f"received {len(received)} of {len(expected)} bytes, first difference at byte "
+                        f"{_first_difference(bytes(received), expected)}")
+    print(f"sent {len(expected)} bytes ({device.sent_samples} samples), received {len(received)}, "
+          f"GUI thread blocked {blocked['ms']} ms of {elapsed * 1000:.0f} ms")
+    print('FAIL: ' + '; '.join(problems) if problems else 'ok', flush=True)
+    device.close()
+    app.aboutToQuit.emit()
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
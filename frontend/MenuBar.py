@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QMainWindow, QMenuBar, QLabel, QPushButton, QMessageBox
+from PyQt6.QtWidgets import QMainWindow, QMenuBar, QLabel, QPushButton, QMessageBox, QFileDialog
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import Qt
 
@@ -57,10 +57,19 @@ class CreateMenuBar():
         closeSerialAction.triggered.connect(self.confirm_close_port)
         killPortAction = QAction('Kill Port', self.main)
         killPortAction.triggered.connect(self.confirm_kill_port)
+        self.recordAction = QAction('Record Session...', self.main)
+        self.recordAction.setEnabled(self.model.can_record())
+        self.recordAction.triggered.connect(self.record_session)
+        self.stopRecordingAction = QAction('Stop Recording', self.main)
+        self.stopRecordingAction.setEnabled(False) # Enabled while a session is being recorded
+        self.stopRecordingAction.triggered.connect(self.model.stop_recording)
         serialMenu.addAction(openSerialAction)
         serialMenu.addAction(toggleDTRAction)
         serialMenu.addAction(closeSerialAction)
         serialMenu.addSeparator()
+        serialMenu.addAction(self.recordAction)
+        serialMenu.addAction(self.stopRecordingAction)
+        serialMenu.addSeparator()
         serialMenu.addAction(killPortAction)
 
         self.model.serial.connected.connect(lambda status: closeSerialAction.setEnabled(status))  # Enable/disable Close Port based on connection status
@@ -94,6 +103,17 @@ class CreateMenuBar():
         if reply == QMessageBox.StandardButton.Yes:
             self.model.serial.kill_port()
 
+    def record_session(self):
+        """Ask for a session file and record the received data to it until Stop Recording"""
+        path, _ = QFileDialog.getSaveFileName(self.main, 'Record Session', '', 'Session files (*.session);;All files (*)')
+        if not path:
+            return
+        created = self.model.recorder is None
+        recorder = self.model.start_recording(path)
+        if created:
+            recorder.recording_changed.connect(self.stopRecordingAction.setEnabled)
+        self.stopRecordingAction.setEnabled(True)
+
     def toggle_theme(self, selected):
         self.model.settings["dark_mode"] = selected
         self.model.settings.apply()
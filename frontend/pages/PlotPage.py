@@ -5,9 +5,11 @@ from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout
 
 from frontend.widgets.LivePlotWidget import LivePlotWidget
 from frontend.widgets.LiveMultiPlotWidget import LiveMultiPlotWidget
-from backend.handlers.TelemetryHandler import IMUData
+from backend.handlers.TelemetryHandler import IMUData, TelemetryBlock, BlockClock
 from frontend.widgets.BasicWidgets import Button, IntNumberInput
 
+PLOTTED_COLUMNS = ('accel_x', 'accel_y', 'accel_z')
+
 class PlotPage(BaseClassPage):
     title = "Plot Page"
 
@@ -25,6 +27,7 @@ class PlotPage(BaseClassPage):
             auto_adjust_on_new_data=True,
             stop_auto_adjust_on_click=True,
             max_region_size=100,
+            target_fps=60,
         )
 
         # self.plot_widget.set_style(background_color="#fff", pen_color="#f00", line_width=2)
@@ -39,19 +42,36 @@ class PlotPage(BaseClassPage):
         hlayout.addWidget(toggle_adjust_btn)
         hlayout.addWidget(buffer_size_input)
         self._t0 = time.monotonic()
+        self._clock = BlockClock()
+        self._skipped_columns: tuple[str, ...] = ()
         layout.addLayout(hlayout)
         layout.addWidget(self.plot_widget)
 
         self.init_signals()
 
     def init_signals(self):
-        self.model.telemetry.on_data.connect(self.handle_telemetry_data)
+        self.model.telemetry.on_block.connect(self.handle_telemetry_block)
 
     def handle_telemetry_data(self, data: IMUData):
         x = time.monotonic() - self._t0
         # y = float(data.accel.z)
         self.plot_widget.append_sample(x, [data.accel.x, data.accel.y, data.accel.z])
 
+    def handle_telemetry_block(self, block: TelemetryBlock):
+        if not self._plots_block(block):
+            return
+        x = self._clock.timestamps(block) - self._t0
+        self.plot_widget.append_samples(x, block.channels(*PLOTTED_COLUMNS).T)
+
+    def _plots_block(self, block: TelemetryBlock) -> bool:
+        """Blocks of a schema without the accelerometer columns are reported once and skipped"""
+        if all(name in block for name in PLOTTED_COLUMNS):
+            return True
+        if block.columns != self._skipped_columns:
+            self._skipped_columns = block.columns
+            self.model.serial.error.emit(f"Plot Page: telemetry has no {', '.join(PLOTTED_COLUMNS)} columns, only {', '.join(block.columns)}")
+        return False
+
     def toggle_auto_adjust(self):
         current_state = self.plot_widget.auto_adjust_on_new_data
         self.plot_widget.auto_adjust_on_new_data = not current_state
\ No newline at end of file
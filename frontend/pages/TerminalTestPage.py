@@ -37,16 +37,16 @@ class TerminalTestPage(BaseClassPage):
         self.consoleWidget.appendText(f"SENT: {inputText}\n")
         self.model.serial.send_data(bytearray(inputText, 'utf-8'))  # Send the input text as bytes to the serial port
 
-    def serial_time_received(self, data: bytearray):
+    def serial_time_received(self, data: memoryview):
         try:
-            decoded_data = data.decode('utf-8')
+            decoded_data = bytes(data).decode('utf-8')
             self.consoleWidget.appendText(f"TIME: {decoded_data}\n", color="blue")
         except UnicodeDecodeError:
-            self.consoleWidget.appendText(f"RAW TIME [{len(data)}]: {data}\n", color="blue")
+            self.consoleWidget.appendText(f"RAW TIME [{len(data)}]: {bytes(data)}\n", color="blue")
 
     def serial_data_received(self, data: bytearray):
         try:
-            decoded_data = data.decode('utf-8')
+            decoded_data = bytes(data).decode('utf-8')
             self.consoleWidget.appendText(decoded_data)
         except UnicodeDecodeError:
             self.consoleWidget.appendText(f"RAW [{len(data)}]: {data}\n")
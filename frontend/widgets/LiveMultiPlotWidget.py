@@ -6,6 +6,10 @@ import numpy as np
 
 import typing as T
 
+from utils.SampleRingBuffer import SampleRingBuffer
+from utils.MinMaxDecimator import MinMaxDecimator
+from frontend.widgets.RenderScheduler import RenderScheduler
+
 PenStyleName = T.Literal['solid', 'dash', 'dot', 'dashdot', 'dashdotdot']
 LineStyleInput = T.Union[Qt.PenStyle, PenStyleName]
 SeriesInput = T.Union[T.Sequence[float], np.ndarray]
@@ -27,6 +31,9 @@ class LiveMultiPlotWidget(QWidget):
         max_region_size: T.Optional[int] = None,
         auto_adjust_on_new_data: bool = True,
         stop_auto_adjust_on_click: bool = True,
+        target_fps: T.Optional[float] = None,
+        decimation: bool = True,
+        nav_fps: T.Optional[float] = 5,
     ) -> None:
         super().__init__()
         if int(line_count) < 1:
@@ -39,8 +46,17 @@ class LiveMultiPlotWidget(QWidget):
         self.auto_adjust_on_new_data = bool(auto_adjust_on_new_data)
         self.stop_auto_adjust_on_click = bool(stop_auto_adjust_on_click)
 
-        self._x = np.array([], dtype=float)
-        self._ys = np.empty((self.line_count, 0), dtype=float)
+        self._samples = SampleRingBuffer(self.line_count, capacity=buffer_size)
+        self._pending_auto_range: T.Optional[bool] = None
+        self._pending_view_update = False
+        self._render_scheduler = RenderScheduler(self._render, target_fps)
+        self.decimation = bool(decimation)
+        self._decimator = MinMaxDecimator(self._samples)
+        # The navigation plot gets a coarse overview of the whole buffer, refreshed at a lower rate
+        self._nav_decimator = MinMaxDecimator(self._samples, points_per_pixel=1)
+        self._nav_scheduler = RenderScheduler(self._refresh_nav_curves, nav_fps)
+        self._curves_cropped = False
+        self._rendering = False
 
         self._sync_targets: T.List['LiveMultiPlotWidget'] = []
         self._sync_guard: bool = False
@@ -77,6 +93,8 @@ class LiveMultiPlotWidget(QWidget):
             self.navPlot.setMaximumHeight(navHeight)
 
         self.mainPlot.getViewBox().setMouseEnabled(y=False, x=True)
+        self.mainPlot.getViewBox().sigXRangeChanged.connect(self._on_view_changed)
+        self.mainPlot.getViewBox().sigResized.connect(self._on_view_changed)
         if self.enable_region:
             self.navPlot.getViewBox().setMouseEnabled(y=False, x=False)
 
@@ -239,17 +257,66 @@ class LiveMultiPlotWidget(QWidget):
 
     def set_buffer_size(self, buffer_size: T.Optional[int]) -> None:
         self.buffer_size = buffer_size
-        if self.buffer_size is not None and self._x.size > self.buffer_size:
-            self._x = self._x[-self.buffer_size:]
-            self._ys = self._ys[:, -self.buffer_size:]
+        trimmed = self.buffer_size is not None and self._samples.size > self.buffer_size
+        self._samples.resize(self.buffer_size)
+        if trimmed:
             self._refresh_curves()
             self._update_view(auto_range=False)
 
     def _refresh_curves(self) -> None:
-        for index in range(self.line_count):
-            self.mainCurves[index].setData(self._x, self._ys[index])
-            if self.enable_region:
-                self.navCurves[index].setData(self._x, self._ys[index])
+        for index, (x_main, y_main) in enumerate(self._main_curve_data()):
+            self.mainCurves[index].setData(x_main, y_main)
+        if self.enable_region:
+            self._nav_scheduler.request_render()
+
+    def _refresh_nav_curves(self) -> None:
+        pixels = max(int(self.navPlot.getViewBox().width()), 200)
+        for index, (x, y) in enumerate(self._nav_decimator.overview(pixels)):
+            self.navCurves[index].setData(x, y)
+
+    @property
+    def target_fps(self) -> T.Optional[float]:
+        return self._render_scheduler.target_fps
+
+    @property
+    def achieved_fps(self) -> float:
+        return self._render_scheduler.achieved_fps
+
+    def set_target_fps(self, target_fps: T.Optional[float]) -> None:
+        """Cap curve updates to target_fps frames per second, None renders on every append"""
+        self._render_scheduler.set_target_fps(target_fps)
+
+    def _request_render(self, auto_range: T.Optional[bool]) -> None:
+        self._pending_auto_range = auto_range
+        self._pending_view_update = True
+        self._render_scheduler.request_render()
+
+    def _render(self) -> None:
+        self._rendering = True
+        try:
+            self._refresh_curves()
+            if self._pending_view_update:
+                self._pending_view_update = False
+                view = self.getViewRangeX()
+                self._update_view(self._pending_auto_range)
+                if self._curves_cropped and self.getViewRangeX() != view:
+                    # Decimated curves only cover a window around the view they were computed for
+                    self._refresh_curves()
+        finally:
+            self._rendering = False
+
+    def _on_view_changed(self, *_: T.Any) -> None:
+        if self._curves_cropped and not self._rendering:
+            self._render_scheduler.request_render()
+
+    def _main_curve_data(self) -> T.List[T.Tuple[np.ndarray, np.ndarray]]:
+        if not self.decimation:
+            self._curves_cropped = False
+            return [(self._samples.x, y) for y in self._samples.ys]
+        lo, hi = self.getViewRangeX()
+        pixels = max(int(self.mainPlot.getViewBox().width()), 200)    # The view box has no width until laid out
+        lines, self._curves_cropped = self._decimator.window(lo, hi, pixels)
+        return lines
 
     def set_data(self, x: SeriesInput, y_values: YValuesInput, auto_range: T.Optional[bool] = None) -> None:
         x = np.asarray(x, dtype=float)
@@ -258,15 +325,8 @@ class LiveMultiPlotWidget(QWidget):
 
         ys = self._coerce_y_values(y_values, x.size)
 
-        if self.buffer_size is not None and x.size > self.buffer_size:
-            x = x[-self.buffer_size:]
-            ys = ys[:, -self.buffer_size:]
-
-        self._x = x
-        self._ys = ys
-        self._refresh_curves()
-
-        self._update_view(auto_range)
+        self._samples.set(x, ys)
+        self._request_render(auto_range)
 
     def append_samples(self, x: SeriesInput, y_values: YValuesInput, auto_range: T.Optional[bool] = None) -> None:
         x = np.asarray(x, dtype=float)
@@ -275,23 +335,14 @@ class LiveMultiPlotWidget(QWidget):
 
         ys = self._coerce_y_values(y_values, x.size)
 
-        self._x = np.concatenate((self._x, x))
-        self._ys = np.concatenate((self._ys, ys), axis=1)
-
-        if self.buffer_size is not None and self._x.size > self.buffer_size:
-            self._x = self._x[-self.buffer_size:]
-            self._ys = self._ys[:, -self.buffer_size:]
-
-        self._refresh_curves()
-
-        self._update_view(auto_range)
+        self._samples.append(x, ys)
+        self._request_render(auto_range)
 
     def append_sample(self, x: float, y_values: YValuesInput, auto_range: T.Optional[bool] = None) -> None:
         self.append_samples([x], y_values, auto_range=auto_range)
 
     def clear(self) -> None:
-        self._x = np.array([], dtype=float)
-        self._ys = np.empty((self.line_count, 0), dtype=float)
+        self._samples.clear()
         for index in range(self.line_count):
             self.mainCurves[index].setData([], [])
             if self.enable_region:
@@ -374,13 +425,14 @@ class LiveMultiPlotWidget(QWidget):
         if not should_adjust:
             return
 
-        if self.max_region_size is None or self._x.size == 0:
+        x = self._samples.x
+        if self.max_region_size is None or x.size == 0:
             self.autoRange()
             return
 
-        visible_count = min(int(self.max_region_size), self._x.size)
-        lo = float(self._x[-visible_count])
-        hi = float(self._x[-1])
+        visible_count = min(int(self.max_region_size), x.size)
+        lo = float(x[-visible_count])
+        hi = float(x[-1])
 
         if self.enable_region:
             self.set_region(lo, hi, emit=False)
@@ -0,0 +1,80 @@
+from PyQt6.QtCore import QObject, QTimer
+
+import time
+import typing as T
+
+
+class RenderScheduler(QObject):
+    """
+    Coalesces render requests of a plot widget into at most target_fps frames per second.
+    With target_fps=None every request renders immediately (no scheduling).
+    """
+
+    def __init__(self, render: T.Callable[[], None], target_fps: T.Optional[float] = None) -> None:
+        super().__init__()
+        self._render = render
+        self._dirty = False
+        self._target_fps: T.Optional[float] = None
+
+        self._frames = 0
+        self._window_start = time.monotonic()
+        self._achieved_fps = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_timeout)
+        self.set_target_fps(target_fps)
+
+    @property
+    def target_fps(self) -> T.Optional[float]:
+        return self._target_fps
+
+    @property
+    def achieved_fps(self) -> float:
+        """Frames actually rendered per second, measured over the last second"""
+        elapsed = time.monotonic() - self._window_start
+        if elapsed >= 2.0:
+            # No frame closed the window recently, report the current rate instead of a stale one
+            return self._frames / elapsed
+        return self._achieved_fps
+
+    def set_target_fps(self, fps: T.Optional[float]) -> None:
+        if fps is not None and float(fps) <= 0:
+            raise ValueError('target_fps must be > 0 or None')
+        self._target_fps = None if fps is None else float(fps)
+        if self._target_fps is None:
+            self._timer.stop()
+            self.flush()
+        else:
+            self._timer.setInterval(max(1, int(round(1000.0 / self._target_fps))))
+
+    def request_render(self) -> None:
+        """Render now if unscheduled, otherwise mark dirty and render on the next frame"""
+        if self._target_fps is None:
+            self._render_frame()
+            return
+        self._dirty = True
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Render pending changes right away"""
+        if self._dirty:
+            self._render_frame()
+
+    def _on_timeout(self) -> None:
+        if not self._dirty:
+            self._timer.stop()  # Idle, restarted by the next request
+            return
+        self._render_frame()
+
+    def _render_frame(self) -> None:
+        self._dirty = False
+        self._render()
+
+        now = time.monotonic()
+        self._frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._achieved_fps = self._frames / elapsed
+            self._frames = 0
+            self._window_start = now
@@ -75,8 +75,14 @@ class SerialPortMenu(QWidget):
     def initSignals(self):
         self.serial_handler.connected.connect(self.on_connection_status_changed)
         self.port_list.itemClicked.connect(self.on_port_clicked)
+        if self.serial_handler.port_watcher is not None:
+            self.serial_handler.port_watcher.ports_changed.connect(lambda _: self.update_port_list())
 
     def scan_ports(self):
+        self.serial_handler.rescan_ports()  # With a port watcher the list is updated again when the scan completes
+        self.update_port_list()
+
+    def update_port_list(self):
         # Clear the list before updating
         self.port_list.clear()
     
@@ -121,7 +127,7 @@ class SerialPortMenu(QWidget):
                 print(f"Page: Port Connected")
             else:
                 print(f"Page: Failed to connect.")
-            print(f"Port status: {'Open' if self.serial_handler.serial_port.isOpen() else 'Closed'}")
+            print(f"Port status: {'Open' if self.serial_handler.is_open() else 'Closed'}")
         except ValueError as e:
             self.serial_handler.error.emit(f"Invalid baud rate: {e}")
 
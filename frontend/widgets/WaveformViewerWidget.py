@@ -6,12 +6,22 @@ import pyqtgraph as pg
 
 import numpy as np
 from scipy import signal
+from scipy.fft import next_fast_len
 
 from .BasicWidgets import DropDownMenu, Button
 from .DynamicSettingsWidget import DynamicSettingsWidget
 from utils.ParamList import ParameterList, NumParam, ChoiceParam
+from utils.ArrayCache import ArrayCache
 
 ALLOWED_WINDOWS = ['barthann','bartlett','blackman','blackmanharris','bohman','boxcar','rectangular','flattop','hamming','hann','tukey',]
+PLOT_CACHE_BYTES = 256 << 20    # Windows and spectra kept by each WaveformViewerWidget
+
+
+def visibleSlice(values, minValue, maxValue):
+    ''' Slice of the sorted array values inside [minValue, maxValue], found by binary search so indexing with it gives a view '''
+    start = int(np.searchsorted(values, minValue, side='left'))
+    stop = int(np.searchsorted(values, maxValue, side='right'))
+    return slice(start, max(start, stop))
 
 
 class AddonBaseClass(QDialog):
@@ -199,7 +209,11 @@ class WaveformViewerWidget(QWidget):
         self.waveformPlot2.setMaximumHeight(navHeight)
 
         self.data = None        # x, y
+        self.dataVersion = 0    # Incremented whenever plot() gets new arrays
+        self.plotCache = ArrayCache(PLOT_CACHE_BYTES)
         self.addonData = {}   
+        self.addonDataKey = None    # Inputs the addonData was computed from
+        self.baseItems = {}         # Items of each plot after the last draw, anything added later belongs to an addon
         self.histDefaultLevels = None
         self.histLastLevels = None
 
@@ -250,33 +264,49 @@ class WaveformViewerWidget(QWidget):
         minX, maxX = self.waveformPlot1.vb.viewRange()[0]
         minY, maxY = self.waveformPlot1.vb.viewRange()[1]
 
-        self.redraw()
+        # Only redraw when the inputs changed since the last draw, otherwise just remove what addons drew on top
+        if self.addonDataKey != self.plotDataKey():
+            self.redraw()
+        else:
+            self.removeAddonItems()
 
+        # Views of the visible part, x, t and f are sorted so no mask or copy of the whole arrays is needed
         if self.plotTypeMenu.selected in ["Waveform", "FFT"]:
             x, y = self.addonData["data"]
-            x = np.array(x)
-            y = np.array(y)
-            mask = (x >= minX) & (x <= maxX)
-            xvis = x[mask]
-            yvis = y[mask]
-            self.addonData["visibleData"] = (xvis, yvis)
+            visX = visibleSlice(x, minX, maxX)
+            self.addonData["visibleData"] = (x[visX], y[visX])
             self.addonData["viewRangeX"] = [minX, maxX]
             self.addonData["viewRangeY"] = [minY, maxY]
             return self.addonData, self.waveformPlot1, self.waveformPlot2
         
         elif self.plotTypeMenu.selected == "Spectrogram":
             f, t, Sxx = self.addonData["data"]
-            maskT = (t >= minX) & (t <= maxX)
-            maskF = (f >= minY) & (f <= maxY)
-            tvis = t[maskT]
-            fvis = f[maskF]
-            Sxxvis = Sxx[maskF, :][:, maskT]
-            self.addonData["visibleData"] = (fvis, tvis, Sxxvis)
+            visT = visibleSlice(t, minX, maxX)
+            visF = visibleSlice(f, minY, maxY)
+            self.addonData["visibleData"] = (f[visF], t[visT], Sxx[visF, visT])
             self.addonData["viewRangeX"] = [minX, maxX]
             self.addonData["viewRangeY"] = [minY, maxY]
             return self.addonData, self.waveformPlot1, self.waveformPlot2
 
 
+    def plotDataKey(self):
+        ''' Everything computePlotData depends on, the data by its version '''
+        if self.data is None:
+            return None
+        settings = tuple(self.settingsDialog[name] for name in ("padding", "FFTWindow", "specWindow", "nperseg", "noverlap"))
+        return (self.dataVersion, self.plotTypeMenu.selected, self.yAxisScale.selected) + settings
+
+
+    def saveBaseItems(self):
+        self.baseItems = {plot: list(plot.items) for plot in (self.waveformPlot1, self.waveformPlot2)}
+
+
+    def removeAddonItems(self):
+        for plot, items in self.baseItems.items():
+            for item in [item for item in plot.items if item not in items]:
+                plot.removeItem(item)
+
+
     def onAddonSelected(self, addon):
         # get the visible data from the waveformPlot1
         print(f"Addon selected: {addon.title}")
@@ -307,6 +337,7 @@ class WaveformViewerWidget(QWidget):
         if self.plotTypeMenu.selected == "Spectrogram" and self.histLastLevels is not None:
             self.histogramPlot.setLevels(*self.histLastLevels)
         self.updateScale()
+        self.saveBaseItems()
 
 
     def scatter(self, x, y):
@@ -342,6 +373,9 @@ class WaveformViewerWidget(QWidget):
             x = x[::subsampling]
             y = y[::subsampling]
 
+        # Cached spectra belong to the arrays they were computed from, new data must come in new arrays
+        if self.data is None or x is not self.data[0] or y is not self.data[1]:
+            self.dataVersion += 1
         self.data = x, y
 
         Ts = x[1] - x[0]    # sampling interval
@@ -354,6 +388,7 @@ class WaveformViewerWidget(QWidget):
         self.plotComputedData(x, y)
         self.autoRange()
         self.updateScale()
+        self.saveBaseItems()
 
 
     def autoRange(self):
@@ -402,11 +437,10 @@ class WaveformViewerWidget(QWidget):
         # print("computePlotData")
         plotType = self.plotTypeMenu.selected
         if plotType == "FFT":
-            # apply the window function
             window = self.settingsDialog["FFTWindow"]
-            y = y * signal.get_window(window, len(y))
-            y = np.abs(np.fft.rfft(y)) / len(y)
-            x = np.fft.rfftfreq(len(x), d=Ts)
+            nfft = self.fftLength(len(y))
+            key = ("FFT", self.dataVersion, len(y), window, nfft)
+            x, y = self.plotCache.get_or_compute(key, lambda: self.computeFFT(y, Ts, window, nfft))
             self.addonData = {
                 "data": (x, y),
                 "type": "FFT",
@@ -423,7 +457,8 @@ class WaveformViewerWidget(QWidget):
             if noverlap >= nperseg:
                 noverlap = nperseg - 10
             window = self.settingsDialog["specWindow"]
-            f, t, Sxx = signal.spectrogram(
+            key = ("Spectrogram", self.dataVersion, len(y), window, nperseg, noverlap)
+            f, t, Sxx = self.plotCache.get_or_compute(key, lambda: signal.spectrogram(
                 y,
                 fs=1 / Ts,
                 window=window,
@@ -431,10 +466,10 @@ class WaveformViewerWidget(QWidget):
                 noverlap=noverlap,
                 scaling='spectrum',
                 mode='magnitude',
-            )
+            ))
 
             if self.yAxisScale.selected == "Log Y":
-                Sxx = np.log10(Sxx)
+                Sxx = self.plotCache.get_or_compute(key + ("Log Y",), lambda: np.log10(Sxx))
 
             self.addonData = {
                 "data": (f, t, Sxx),
@@ -469,8 +504,26 @@ class WaveformViewerWidget(QWidget):
         else:
             raise ValueError("Invalid plot type")
         
+        self.addonDataKey = self.plotDataKey()
         return x, y
 
+    def computeFFT(self, y, Ts, window, nfft):
+        # apply the window function, then zero pad to nfft
+        y = y * self.getWindow(window, len(y))
+        return np.fft.rfftfreq(nfft, d=Ts), np.abs(np.fft.rfft(y, n=nfft)) / len(y)
+
+
+    def fftLength(self, n):
+        # A padded signal may take a few more zeros to reach a length the FFT is fast for
+        if int(self.settingsDialog["padding"]) > 0:
+            return next_fast_len(n, real=True)
+        return n
+
+
+    def getWindow(self, window, n):
+        return self.plotCache.get_or_compute(("window", window, n), lambda: signal.get_window(window, n))
+
+
     def clear(self):
         # Clear the plots
         self.waveformPlot1.clear()
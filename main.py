@@ -1,4 +1,5 @@
 # main.py
+import os
 import sys
 from PyQt6.QtWidgets import QApplication
 
@@ -29,8 +30,8 @@ def main():
     sigint_timer.timeout.connect(lambda: None)
     sigint_timer.start(200)
 
-    # create a Data Model
-    mainModel = MainModel(app)
+    # create a Data Model, attached to a headless acquisition service if one is given (see service.py)
+    mainModel = MainModel(app, service_socket=os.environ.get("ACQUISITION_SERVICE"))
 
     # create pages
     pages = [
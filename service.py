@@ -0,0 +1,66 @@
+# service.py
+"""
+Headless acquisition: the serial and telemetry stack of MainModel, served to GUI clients over a local socket.
+
+    python service.py --socket /tmp/acquisition.sock [--port /dev/ttyACM0 --baudrate 1000000] [--schema imu9_csv]
+
+Without --port it auto-connects to an Arduino like the GUI does. Start the GUI against it with
+    ACQUISITION_SERVICE=/tmp/acquisition.sock python main.py
+"""
+import argparse
+import signal
+import sys
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from backend.handlers.SerialPortHandler import SerialPortHandler, SerialPortData
+from backend.handlers.SerialPortWatcher import SerialPortWatcher
+from backend.handlers.TelemetryHandler import TelemetryHandler
+from backend.handlers.AcquisitionService import AcquisitionService, DEFAULT_SOCKET
+from utils.TelemetrySchema import schema_names
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Local socket path clients connect to")
+    parser.add_argument('--port', help="Serial port name, auto-connect when omitted")
+    parser.add_argument('--baudrate', type=int, default=1000000)
+    parser.add_argument('--reset-pulse', type=int, default=SerialPortHandler.reset_pulse_ms, help="DTR/RTS reset pulse ms on connect, 0 for none")
+    parser.add_argument('--schema', choices=schema_names(), help="Telemetry schema, CSV IMU lines when omitted")
+    parser.add_argument('--viewer-buffer', type=int, default=4 << 20, help="Unsent bytes after which a viewer skips blocks")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication(sys.argv)
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    sigint_timer = QTimer()
+    sigint_timer.timeout.connect(lambda: None)
+    sigint_timer.start(200)
+
+    port_watcher = SerialPortWatcher()
+    serial = SerialPortHandler(threaded=True, port_watcher=port_watcher)
+    serial.set_wait_time(10)
+    serial.set_reset_timing(args.reset_pulse)
+    telemetry = TelemetryHandler(batch=True)
+    if args.schema:
+        telemetry.set_schema(args.schema)
+    serial.data_received.connect(telemetry.handle_serial_data)
+    serial.error.connect(lambda message: print(f"Serial: {message}", file=sys.stderr))
+
+    service = AcquisitionService(serial, telemetry, args.socket, args.viewer_buffer)
+    if not service.listen():
+        print(f"Cannot listen on {args.socket}: {service.server.errorString()}", file=sys.stderr)
+        return 1
+    service.clients_changed.connect(lambda count: print(f"{count} client(s)"))
+
+    if args.port:
+        serial.selected_port = SerialPortData(name=args.port, baudrate=args.baudrate)
+        serial.connect()
+    else:
+        serial.auto_connect(include_manufacturer="arduino", baudrate=args.baudrate)
+    print(f"Serving on {args.socket}")
+    return app.exec()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Least recently used cache of numpy arrays bounded by their total size in bytes.
+
+A value is an array or a tuple of arrays, its size the sum of their nbytes. Storing a value evicts the least
+recently used ones until the total fits in max_bytes; a value larger than max_bytes is not stored.
+Cached arrays are made read-only, since every get returns the same objects.
+"""
+
+from collections import OrderedDict
+import typing as T
+
+import numpy as np
+
+Value = T.Union[np.ndarray, T.Tuple[np.ndarray, ...]]
+
+
+def _arrays(value: Value) -> T.Tuple[np.ndarray, ...]:
+    return value if isinstance(value, tuple) else (value,)
+
+
+class ArrayCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[T.Hashable, T.Tuple[Value, int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: T.Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: T.Hashable) -> T.Optional[Value]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: T.Hashable, value: Value) -> Value:
+        """Store value under key and return it"""
+        self.discard(key)
+        size = sum(array.nbytes for array in _arrays(value))
+        if size > self.max_bytes:
+            return value
+        for array in _arrays(value):
+            array.flags.writeable = False
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+        return value
+
+    def get_or_compute(self, key: T.Hashable, compute: T.Callable[[], Value]) -> Value:
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def discard(self, key: T.Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
@@ -0,0 +1,82 @@
+"""
+Compact binary framing of sample blocks and control messages over a byte stream (a local socket).
+
+Every message is a 5 byte header, type (u8) and payload length (u32 little endian), followed by the payload.
+A BLOCK payload is the sequence number of its first sample (u64), the sample count (u32) and the channel count (u16),
+then count float64 timestamps and count x channels float64 values, so a receiver decodes it with two
+np.frombuffer calls. A gap between the sequence numbers of consecutive blocks is samples the sender dropped.
+Every other message carries a small JSON object.
+"""
+
+import json
+import struct
+import typing as T
+
+import numpy as np
+
+MSG_HELLO = 1       # Client -> service: {'role': 'viewer' | 'recorder', 'name': str}
+MSG_INFO = 2        # Service -> client: {'columns': [...], 'port': str, 'connected': bool}
+MSG_BLOCK = 3       # Service -> client: samples
+MSG_STATUS = 4      # Service -> client: {'connected': bool, 'port': str} or {'error': str}
+MSG_COMMAND = 5     # Client -> service: {'command': 'connect', 'port': str, 'baudrate': int} (port optional),
+                    # 'disconnect', 'reset' (DTR/RTS pulse) or 'send' with 'data': base64 bytes
+
+HEADER = struct.Struct('<BI')
+BLOCK_HEADER = struct.Struct('<QIH')
+MAX_PAYLOAD = 1 << 28
+
+
+def encode_message(kind: int, payload: bytes) -> bytes:
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_json(kind: int, message: T.Dict[str, T.Any]) -> bytes:
+    return encode_message(kind, json.dumps(message).encode('utf-8'))
+
+
+def decode_json(payload: bytes) -> T.Dict[str, T.Any]:
+    """Raises ValueError when the payload is not a UTF-8 JSON object"""
+    message = json.loads(payload.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError(f"Expected a JSON object, got {type(message).__name__}")
+    return message
+
+
+def encode_block(sequence: int, timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    count, channels = values.shape
+    header = BLOCK_HEADER.pack(sequence, count, channels)
+    return b''.join((HEADER.pack(MSG_BLOCK, BLOCK_HEADER.size + 8 * count * (1 + channels)), header,
+                     np.ascontiguousarray(timestamps, dtype='<f8').tobytes(),
+                     np.ascontiguousarray(values, dtype='<f8').tobytes()))
+
+
+def decode_block(payload: bytes) -> T.Tuple[int, np.ndarray, np.ndarray]:
+    """sequence, timestamps and (count, channels) values, viewing payload without copying. ValueError if truncated"""
+    if len(payload) < BLOCK_HEADER.size:
+        raise ValueError(f"Block of {len(payload)} bytes is shorter than its header")
+    sequence, count, channels = BLOCK_HEADER.unpack_from(payload)
+    timestamps = np.frombuffer(payload, dtype='<f8', count=count, offset=BLOCK_HEADER.size)
+    values = np.frombuffer(payload, dtype='<f8', count=count * channels, offset=BLOCK_HEADER.size + 8 * count)
+    return sequence, timestamps, values.reshape(count, channels)
+
+
+class MessageDecoder:
+    """Splits a byte stream into (type, payload) messages, keeping a partial message for the next feed"""
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> T.List[T.Tuple[int, bytes]]:
+        self.buffer.extend(data)
+        messages = []
+        position = 0
+        while len(self.buffer) - position >= HEADER.size:
+            kind, length = HEADER.unpack_from(self.buffer, position)
+            if length > MAX_PAYLOAD:
+                raise ValueError(f"Message of {length} bytes, the stream is corrupt")
+            end = position + HEADER.size + length
+            if end > len(self.buffer):
+                break
+            messages.append((kind, bytes(self.buffer[position + HEADER.size:end])))
+            position = end
+        del self.buffer[:position]
+        return messages
@@ -0,0 +1,113 @@
+"""
+Online mapping of a device clock to the host clock.
+
+Devices stamp their samples with a counter (a free running timer or a sample counter) that starts anywhere,
+wraps, and drifts a few ppm against the host. Every block gives one pair: the device time of its last sample
+and the host time it was handled. The host time is late by a variable delay (USB, batching, a busy event loop)
+but never early, so the least delayed pair of every interval_s is kept, host = offset + rate * device is fitted
+through the pairs of the last window_s by least squares, and the line is moved down onto the lowest of them.
+Drift is followed while the delivery delay does not move the mapped times.
+"""
+
+import collections
+import typing as T
+
+import numpy as np
+
+
+class ClockSync:
+    def __init__(self, tick_seconds: float = 1e-6, wrap: T.Optional[int] = 1 << 32, interval_s: float = 0.25,
+                 window_s: float = 60.0, min_span_s: float = 2.0, reset_s: float = 1.0) -> None:
+        """
+        tick_seconds: device seconds per counter tick, e.g. 1e-6 for microseconds or 1 / rate for a sample counter
+        wrap: the counter wraps to 0 at this value, None if it never does
+        min_span_s: the rate is taken as 1.0 until the pairs cover this many seconds
+        reset_s: a device time this far ahead of the host starts over, like a jump back of the counter does
+        """
+        self.tick_seconds = float(tick_seconds)
+        self.wrap = int(wrap) if wrap is not None else None
+        self.interval_s = float(interval_s)
+        self.min_span_s = float(min_span_s)
+        self.reset_s = float(reset_s)
+        self._points: T.Deque[T.Tuple[float, float]] = collections.deque(maxlen=max(2, int(window_s / interval_s)))
+        self.resets = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the fit and the counter position, for a new device or session"""
+        self._points.clear()
+        self._candidate: T.Optional[T.Tuple[float, float]] = None     # Least delayed pair of the current interval
+        self._interval_start = 0.0
+        self._last_tick: T.Optional[int] = None
+        self._ticks = 0             # Unwrapped ticks since the first sample
+        self.rate = 1.0
+        self.offset = 0.0
+
+    @property
+    def synchronized(self) -> bool:
+        return self._candidate is not None
+
+    def unwrap(self, ticks: np.ndarray) -> np.ndarray:
+        """Raw counter values to continuous device seconds. A jump back of the counter means the device restarted"""
+        ticks = np.asarray(ticks).astype(np.int64)
+        if ticks.size == 0:
+            return np.empty(0)
+        previous = np.empty_like(ticks)
+        previous[0] = ticks[0] if self._last_tick is None else self._last_tick
+        previous[1:] = ticks[:-1]
+        deltas = ticks - previous
+        if self.wrap is not None:
+            deltas %= self.wrap
+            restarted = deltas > self.wrap // 2
+        else:
+            restarted = deltas < 0
+        if restarted.any():
+            # Device time is not continuous any more, start the fit over from the new counter values
+            self._restart()
+            deltas[restarted] = 0
+        total = self._ticks + np.cumsum(deltas)
+        self._ticks = int(total[-1])
+        self._last_tick = int(ticks[-1])
+        return total * self.tick_seconds
+
+    def update(self, device_s: float, host_s: float) -> None:
+        """Add a pair: a device time and the host time at which it was received"""
+        if self._candidate is not None and self.to_host(device_s) - host_s > self.reset_s:
+            self._restart()
+        if self._candidate is None:
+            self._candidate = (device_s, host_s)
+            self._interval_start = device_s
+        elif device_s - self._interval_start >= self.interval_s:
+            self._points.append(self._candidate)
+            self._candidate = (device_s, host_s)
+            self._interval_start = device_s
+        elif host_s - device_s <= self._candidate[1] - self._candidate[0]:
+            self._candidate = (device_s, host_s)
+        self._fit()
+
+    def to_host(self, device_s: np.ndarray) -> np.ndarray:
+        return self.offset + self.rate * np.asarray(device_s)
+
+    def map(self, ticks: np.ndarray, host_s: float) -> np.ndarray:
+        """Host times of the samples of a block with these counter values, received at host_s"""
+        device_s = self.unwrap(ticks)
+        if device_s.size == 0:
+            return device_s
+        self.update(float(device_s[-1]), host_s)
+        return self.to_host(device_s)
+
+    def _restart(self) -> None:
+        self._points.clear()
+        self._candidate = None
+        self.rate = 1.0
+        self.resets += 1
+
+    def _fit(self) -> None:
+        points = np.array([*self._points, self._candidate])
+        device, host = points[:, 0], points[:, 1]
+        rate = 1.0
+        if device[-1] - device[0] >= self.min_span_s:
+            d = device - device.mean()
+            rate = float(np.dot(d, host - host.mean()) / np.dot(d, d))
+        self.rate = rate
+        self.offset = float(np.min(host - rate * device))
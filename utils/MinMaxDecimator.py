@@ -0,0 +1,159 @@
+"""
+Peak-preserving min/max decimation of a SampleRingBuffer for plotting.
+
+The samples are grouped in buckets of B samples (B a power of two, aligned to the absolute
+sample index) and every bucket is reduced to its minimum and maximum, so spikes survive at
+any zoom level. B is picked from the number of samples in the visible x-range and the width
+of the plot in pixels, giving about one bucket per pixel.
+
+Each bucket size is a level that keeps its reduced buckets in its own SampleRingBuffer and is
+updated incrementally: only samples appended since the last call are reduced. A level is built
+from the whole buffer only the first time it is used. x is expected to be increasing.
+
+overview() summarizes the whole buffer for a fixed pixel width: its cost per call and the memory of
+its level depend on the width and on the samples appended since the last call, not on the capacity.
+"""
+
+from collections import OrderedDict
+import typing as T
+
+import numpy as np
+
+from utils.SampleRingBuffer import SampleRingBuffer
+
+LineData = T.List[T.Tuple[np.ndarray, np.ndarray]]
+
+
+def _reduce_blocks(x: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Reduce x (nb, B) and ys (L, nb, B) to rows [min(L), max(L), x_of_min(L), x_of_max(L)] with shape (4L, nb)"""
+    imn = ys.argmin(axis=2)
+    imx = ys.argmax(axis=2)
+    mn = np.take_along_axis(ys, imn[..., None], axis=2)[..., 0]
+    mx = np.take_along_axis(ys, imx[..., None], axis=2)[..., 0]
+    block = np.arange(x.shape[0])[None, :]
+    return np.concatenate((mn, mx, x[block, imn], x[block, imx]))
+
+
+class _MinMaxLevel:
+    def __init__(self, line_count: int, bucket_size: int, capacity: T.Optional[int]) -> None:
+        self.line_count = line_count
+        self.bucket_size = bucket_size
+        # x row holds the bucket number, the line rows hold the _reduce_blocks output
+        self.buckets = SampleRingBuffer(4 * line_count, capacity=capacity)
+        self.next_bucket: T.Optional[int] = None
+
+    def update(self, samples: SampleRingBuffer) -> None:
+        B = self.bucket_size
+        oldest = samples.total - samples.size
+        first = -(-oldest // B)
+        if self.next_bucket is None or self.next_bucket < first:
+            # Samples we never reduced were evicted, every stored bucket is older than them
+            self.buckets.clear()
+            self.next_bucket = first
+
+        last = samples.total // B
+        if last <= self.next_bucket:
+            return
+
+        nb = last - self.next_bucket
+        a = self.next_bucket * B - oldest
+        b = last * B - oldest
+        x = samples.x[a:b].reshape(nb, B)
+        ys = samples.ys[:, a:b].reshape(self.line_count, nb, B)
+        self.buckets.append(np.arange(self.next_bucket, last, dtype=float), _reduce_blocks(x, ys))
+        self.next_bucket = last
+
+
+class MinMaxDecimator:
+    def __init__(self, samples: SampleRingBuffer, points_per_pixel: int = 2, max_levels: int = 4) -> None:
+        self.samples = samples
+        self.points_per_pixel = int(points_per_pixel)
+        self.max_levels = int(max_levels)
+        self._levels: 'OrderedDict[int, _MinMaxLevel]' = OrderedDict()
+        self._source_state: T.Tuple[int, int, bool] = self._state()
+
+    def _state(self) -> T.Tuple[int, int, bool]:
+        return self.samples.resets, self.samples.capacity, self.samples.bounded
+
+    def _level(self, bucket_size: int) -> _MinMaxLevel:
+        level = self._levels.get(bucket_size)
+        if level is None:
+            capacity = self.samples.capacity // bucket_size + 2 if self.samples.bounded else None
+            level = _MinMaxLevel(self.samples.line_count, bucket_size, capacity)
+            self._levels[bucket_size] = level
+            while len(self._levels) > self.max_levels:
+                self._levels.popitem(last=False)
+        else:
+            self._levels.move_to_end(bucket_size)
+        level.update(self.samples)
+        return level
+
+    def overview(self, pixels: int) -> LineData:
+        """Return the (x, y) arrays of every line summarizing the whole buffer for a plot pixels wide"""
+        x = self.samples.x
+        if x.size == 0:
+            return [(x, y) for y in self.samples.ys]
+        lines, _ = self.window(float(x[0]), float(x[-1]), pixels)
+        return lines
+
+    def window(self, lo: float, hi: float, pixels: int) -> T.Tuple[LineData, bool]:
+        """
+        Return the (x, y) arrays of every line for an x-range [lo, hi] drawn on a plot pixels wide,
+        and whether they were cropped to a window around it (the caller must refresh when the view moves).
+        """
+        if self._state() != self._source_state:
+            self._levels.clear()
+            self._source_state = self._state()
+
+        x = self.samples.x
+        ys = self.samples.ys
+        pixels = max(int(pixels), 1)
+        budget = self.points_per_pixel * pixels
+
+        # Render one view width of margin on each side, so small pans and new samples stay covered
+        if x.size <= 3 * budget:
+            return [(x, ys[index]) for index in range(self.samples.line_count)], False
+        i0 = int(np.searchsorted(x, lo, side='left'))
+        i1 = int(np.searchsorted(x, hi, side='right'))
+        span = max(i1 - i0, 1)
+        a = max(0, i0 - span)
+        b = min(x.size, i1 + span)
+        if b - a <= 3 * budget:
+            return [(x[a:b], ys[index, a:b]) for index in range(self.samples.line_count)], True
+
+        B = 1 << max(1, int(np.ceil(np.log2(span / pixels))))
+        level = self._level(B)
+
+        # Whole buckets come from the level, the partial ones at both ends are reduced on the fly
+        oldest = self.samples.total - self.samples.size
+        first_bucket = -(-(oldest + a) // B)
+        last_bucket = (oldest + b) // B
+        head_end = min(b, first_bucket * B - oldest)
+        tail_start = max(head_end, last_bucket * B - oldest)
+        stored_first = int(level.buckets.x[0]) if level.buckets.size else last_bucket
+        p0 = max(0, first_bucket - stored_first)
+        p1 = max(p0, last_bucket - stored_first)
+
+        blocks = []
+        if head_end > a:
+            blocks.append(_reduce_blocks(x[None, a:head_end], ys[:, None, a:head_end]))
+        blocks.append(level.buckets.ys[:, p0:p1])
+        if b > tail_start:
+            blocks.append(_reduce_blocks(x[None, tail_start:b], ys[:, None, tail_start:b]))
+        rows = np.concatenate(blocks, axis=1)
+
+        L = self.samples.line_count
+        mn, mx, xmn, xmx = rows[:L], rows[L:2 * L], rows[2 * L:3 * L], rows[3 * L:]
+        min_first = xmn <= xmx
+        # Both ends of the window are kept as well, so the trace reaches the newest sample
+        out_x = np.empty((L, 2 * rows.shape[1] + 2))
+        out_y = np.empty_like(out_x)
+        out_x[:, 1:-1:2] = np.where(min_first, xmn, xmx)
+        out_x[:, 2:-1:2] = np.where(min_first, xmx, xmn)
+        out_y[:, 1:-1:2] = np.where(min_first, mn, mx)
+        out_y[:, 2:-1:2] = np.where(min_first, mx, mn)
+        out_x[:, 0] = x[a]
+        out_y[:, 0] = ys[:, a]
+        out_x[:, -1] = x[b - 1]
+        out_y[:, -1] = ys[:, b - 1]
+        return [(out_x[index], out_y[index]) for index in range(L)], True
@@ -0,0 +1,123 @@
+"""
+Bounded, chunked byte buffer between a serial reader and its consumer.
+
+Chunks are stored as received (no copy on push, one join on take). When a push does not fit the
+capacity the overflow policy decides what is lost, and every lost byte is counted in dropped:
+
+    drop_oldest  discard the oldest buffered bytes to make room
+    drop_newest  discard the part of the new data that does not fit
+    block        nothing is discarded, the reader must only read free() bytes and leave the rest in the port
+
+Push and take may be called from different threads. take() also records in taken_time the time.monotonic()
+of the last push it returned, when the reader had the data, however long the consumer took to take it.
+"""
+
+from collections import deque
+import threading
+import time
+import typing as T
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+class ReceiveBuffer:
+    def __init__(self, capacity: int = 1 << 20, policy: str = 'drop_oldest') -> None:
+        self._lock = threading.Lock()
+        self._chunks: T.Deque[bytes] = deque()
+        self._size = 0
+        self._notified = False
+        self._last_push_time = 0.0
+        self.taken_time = 0.0
+        self.dropped = 0
+        self.set_policy(policy, capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set_policy(self, policy: str, capacity: T.Optional[int] = None) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {OVERFLOW_POLICIES}")
+        with self._lock:
+            self._policy = policy
+            if capacity is not None:
+                if int(capacity) < 1:
+                    raise ValueError('capacity must be >= 1')
+                self._capacity = int(capacity)
+            excess = self._size - self._capacity
+            if excess > 0:
+                self._drop_oldest(excess)
+                self.dropped += excess
+
+    def free(self) -> int:
+        return max(0, self._capacity - self._size)
+
+    def push(self, data: bytes) -> int:
+        """Store data applying the overflow policy, return the number of bytes dropped"""
+        n = len(data)
+        if n == 0:
+            return 0
+        with self._lock:
+            free = self._capacity - self._size
+            if n <= free:
+                lost = 0
+            elif self._policy == 'drop_oldest':
+                if n >= self._capacity:
+                    lost = self._size + n - self._capacity
+                    self._chunks.clear()
+                    self._size = 0
+                    data = data[-self._capacity:]
+                else:
+                    lost = n - free
+                    self._drop_oldest(lost)
+            else:
+                # drop_newest, or a block reader that read more than free()
+                lost = n - max(free, 0)
+                data = data[:max(free, 0)]
+            if data:
+                self._chunks.append(bytes(data))
+                self._size += len(data)
+                self._last_push_time = time.monotonic()
+            self.dropped += lost
+            return lost
+
+    def claim_notification(self) -> bool:
+        """Return True once per batch of data, until the next take(), so the consumer is notified only once"""
+        with self._lock:
+            if self._notified or self._size == 0:
+                return False
+            self._notified = True
+            return True
+
+    def take(self) -> bytes:
+        """Remove and return everything buffered"""
+        with self._lock:
+            data = b''.join(self._chunks)
+            if data:
+                self.taken_time = self._last_push_time
+            self._chunks.clear()
+            self._size = 0
+            self._notified = False
+            return data
+
+    def clear(self) -> None:
+        self.take()
+
+    def _drop_oldest(self, count: int) -> None:
+        while count > 0 and self._chunks:
+            chunk = self._chunks[0]
+            if len(chunk) <= count:
+                self._chunks.popleft()
+                self._size -= len(chunk)
+                count -= len(chunk)
+            else:
+                self._chunks[0] = chunk[count:]
+                self._size -= count
+                count = 0
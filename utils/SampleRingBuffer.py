@@ -0,0 +1,126 @@
+"""
+Fixed-capacity circular store for plot samples: one x row plus N y rows.
+
+The storage is mirrored (every sample is written twice, at i and i + capacity), so the
+samples currently held are always available as one contiguous view without copying.
+Appending k samples costs O(k) regardless of the capacity.
+
+If capacity is None the store grows by doubling instead of discarding old samples.
+
+total counts the samples appended since the last clear, so total - size is the absolute index of
+the oldest sample held. resets increments on every clear, letting derived caches detect it.
+"""
+
+import typing as T
+import numpy as np
+
+
+class SampleRingBuffer:
+    def __init__(self, line_count: int = 1, capacity: T.Optional[int] = None, initial_capacity: int = 1024) -> None:
+        if int(line_count) < 1:
+            raise ValueError('line_count must be >= 1')
+        self.line_count = int(line_count)
+        self.bounded = capacity is not None
+        self._capacity = self._validate_capacity(capacity if capacity is not None else initial_capacity)
+        self._data = np.empty((self.line_count + 1, 2 * self._capacity), dtype=float)
+        self._start = 0     # index of the oldest sample, always < capacity
+        self._size = 0
+        self.total = 0
+        self.resets = 0
+
+    @staticmethod
+    def _validate_capacity(capacity: int) -> int:
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError('capacity must be >= 1')
+        return capacity
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def x(self) -> np.ndarray:
+        """Contiguous view of the x values, oldest first"""
+        return self._data[0, self._start:self._start + self._size]
+
+    @property
+    def ys(self) -> np.ndarray:
+        """Contiguous view of the y values with shape (line_count, size)"""
+        return self._data[1:, self._start:self._start + self._size]
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+        self.total = 0
+        self.resets += 1
+
+    def resize(self, capacity: T.Optional[int]) -> None:
+        """Change the capacity keeping the newest samples. None makes the store grow on demand"""
+        self.bounded = capacity is not None
+        if capacity is None:
+            return
+        self._reallocate(self._validate_capacity(capacity))
+
+    def set(self, x: np.ndarray, ys: np.ndarray) -> None:
+        """Replace the content with x (k,) and ys (line_count, k), reusing the storage when it fits"""
+        self.clear()
+        self.append(x, ys)
+
+    def append(self, x: np.ndarray, ys: np.ndarray) -> None:
+        """Append x (k,) and ys (line_count, k)"""
+        k = int(x.shape[0])
+        if k == 0:
+            return
+        if ys.shape != (self.line_count, k):
+            raise ValueError('ys shape must be (line_count, len(x))')
+        self.total += k
+
+        if self._size + k > self._capacity and not self.bounded:
+            self._reallocate(max(2 * self._capacity, self._size + k))
+
+        cap = self._capacity
+        if k >= cap:
+            # Only the newest samples survive, lay them out from the beginning
+            self._data[0, :cap] = x[-cap:]
+            self._data[1:, :cap] = ys[:, -cap:]
+            self._data[:, cap:] = self._data[:, :cap]
+            self._start = 0
+            self._size = cap
+            return
+
+        write = (self._start + self._size) % cap
+        end = write + k     # < 2 * cap
+        self._data[0, write:end] = x
+        self._data[1:, write:end] = ys
+
+        # Mirror the written span into the other half
+        split = min(end, cap)
+        if write < split:
+            self._data[:, write + cap:split + cap] = self._data[:, write:split]
+        if end > cap:
+            lo = max(write, cap)
+            self._data[:, lo - cap:end - cap] = self._data[:, lo:end]
+
+        self._size += k
+        if self._size > cap:
+            self._start = (self._start + self._size - cap) % cap
+            self._size = cap
+
+    def _reallocate(self, capacity: int) -> None:
+        keep = min(self._size, capacity)
+        data = np.empty((self.line_count + 1, 2 * capacity), dtype=float)
+        end = self._start + self._size
+        data[:, :keep] = self._data[:, end - keep:end]
+        data[:, capacity:capacity + keep] = data[:, :keep]
+        self._data = data
+        self._capacity = capacity
+        self._start = 0
+        self._size = keep
@@ -0,0 +1,220 @@
+"""
+Delimiter-based binary framing for serial streams: COBS and SLIP, with an optional CRC-16 or CRC-32 trailer.
+
+Both encodings guarantee the delimiter never appears inside a frame, so payloads may contain any byte.
+The stream is split on the delimiter with bytes.split and escapes are undone with bytes.replace, so the
+per-byte work runs in C. COBS decoding loops once per zero byte of the payload, not once per byte.
+
+The CRC is computed over the payload and appended little-endian before encoding:
+crc16 is CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), crc32 is the zlib CRC-32.
+
+BinaryFrameDecoder handles the other common layout: fixed-size records that start with a sync word.
+"""
+
+import binascii
+import typing as T
+import zlib
+
+import numpy as np
+
+FRAMING_MODES = ('cobs', 'slip')
+CRC_MODES = (None, 'crc16', 'crc32')
+
+SLIP_END = 0xC0
+SLIP_ESC = 0xDB
+SLIP_ESC_END = 0xDC
+SLIP_ESC_ESC = 0xDD
+
+
+def crc16(data: bytes) -> int:
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def crc32(data: bytes) -> int:
+    return zlib.crc32(data)
+
+
+_CRC = {
+    None: (0, None),
+    'crc16': (2, crc16),
+    'crc32': (4, crc32),
+}
+
+
+def cobs_encode(data: bytes) -> bytes:
+    out = bytearray()
+    for block in bytes(data).split(b'\x00'):
+        # Blocks longer than 254 bytes are split with 0xFF codes, which imply no zero
+        while len(block) >= 0xFE:
+            out.append(0xFF)
+            out += block[:0xFE]
+            block = block[0xFE:]
+        out.append(len(block) + 1)
+        out += block
+    return bytes(out)
+
+
+def cobs_decode(frame: bytes) -> T.Optional[bytes]:
+    """Decode one COBS frame (without the delimiter). Returns None if the frame is malformed"""
+    out = bytearray()
+    n = len(frame)
+    i = 0
+    while i < n:
+        code = frame[i]
+        end = i + code
+        if code == 0 or end > n:
+            return None
+        out += frame[i + 1:end]
+        i = end
+        if code != 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+def slip_encode(data: bytes) -> bytes:
+    return bytes(data).replace(b'\xdb', b'\xdb\xdd').replace(b'\xc0', b'\xdb\xdc')
+
+
+def slip_decode(frame: bytes) -> T.Optional[bytes]:
+    """Decode one SLIP frame (without the END bytes). Returns None on an invalid escape"""
+    escapes = frame.count(b'\xdb')
+    if escapes == 0:
+        return bytes(frame)
+    if escapes != frame.count(b'\xdb\xdc') + frame.count(b'\xdb\xdd'):
+        return None
+    return bytes(frame).replace(b'\xdb\xdc', b'\xc0').replace(b'\xdb\xdd', b'\xdb')
+
+
+def encode_frame(payload: bytes, mode: str = 'cobs', crc: T.Optional[str] = None) -> bytes:
+    """Encode one payload as a complete frame, delimiters included"""
+    if mode not in FRAMING_MODES:
+        raise ValueError(f"Unknown framing mode {mode!r}, expected one of {FRAMING_MODES}")
+    if crc not in _CRC:
+        raise ValueError(f"Unknown CRC {crc!r}, expected one of {CRC_MODES}")
+    size, func = _CRC[crc]
+    if func is not None:
+        payload = bytes(payload) + func(payload).to_bytes(size, 'little')
+    if mode == 'cobs':
+        return cobs_encode(payload) + b'\x00'
+    return b'\xc0' + slip_encode(payload) + b'\xc0'
+
+
+class FrameDecoder:
+    """
+    Splits a byte stream on the mode's delimiter and decodes every complete frame.
+    bad_crc counts frames dropped on a CRC mismatch, resyncs counts malformed or oversized frames that were dropped.
+    """
+    max_frame_size = 65536
+
+    def __init__(self, mode: str = 'cobs', crc: T.Optional[str] = None):
+        if mode not in FRAMING_MODES:
+            raise ValueError(f"Unknown framing mode {mode!r}, expected one of {FRAMING_MODES}")
+        if crc not in _CRC:
+            raise ValueError(f"Unknown CRC {crc!r}, expected one of {CRC_MODES}")
+        self.mode = mode
+        self.crc = crc
+        self._crc_size, self._crc_func = _CRC[crc]
+        self._delimiter = b'\x00' if mode == 'cobs' else b'\xc0'
+        self._decode = cobs_decode if mode == 'cobs' else slip_decode
+        self._pending = b''
+        self._synced = False
+        self.frames = 0
+        self.bad_crc = 0
+        self.resyncs = 0
+
+    def reset(self) -> None:
+        """Forget the partial frame, the next frame is only trusted after a delimiter"""
+        self._pending = b''
+        self._synced = False
+
+    def feed(self, data: bytes) -> T.List[bytes]:
+        """Return the payloads of every frame completed by data, CRC stripped"""
+        parts = (self._pending + bytes(data)).split(self._delimiter)
+        self._pending = parts.pop()
+        if len(self._pending) > self.max_frame_size:
+            self._pending = b''
+            self._synced = False
+            self.resyncs += 1
+        if not parts:
+            return []
+        if not self._synced:
+            # Bytes before the first delimiter may start mid-frame
+            parts[0] = b''
+            self._synced = True
+
+        payloads = []
+        decode = self._decode
+        crc_size = self._crc_size
+        crc_func = self._crc_func
+        for part in parts:
+            if not part:
+                continue    # Back to back delimiters (SLIP frames start and end with END)
+            payload = decode(part)
+            if payload is None or len(payload) < crc_size:
+                self.resyncs += 1
+                continue
+            if crc_func is not None:
+                body = payload[:-crc_size]
+                if crc_func(body) != int.from_bytes(payload[-crc_size:], 'little'):
+                    self.bad_crc += 1
+                    continue
+                payload = body
+            payloads.append(payload)
+        self.frames += len(payloads)
+        return payloads
+
+
+class BinaryFrameDecoder:
+    """
+    Decodes fixed-layout binary frames made of a sync word followed by one record of a NumPy structured dtype.
+    Aligned frames are validated by their sync word all at once and decoded with np.frombuffer without copying
+    each record. On a missing sync word the decoder drops bytes up to the next one and counts a resync.
+    """
+    def __init__(self, dtype: np.dtype, sync: bytes):
+        if not sync:
+            raise ValueError("A sync word is required to find frame boundaries")
+        self.dtype = np.dtype(dtype)
+        self.sync = bytes(sync)
+        self.frame_dtype = np.dtype([('sync', f'V{len(self.sync)}'), ('record', self.dtype)])
+        self.frame_size = self.frame_dtype.itemsize
+        self.buffer = bytearray()
+        self.resyncs = 0
+        self._sync_bytes = np.frombuffer(self.sync, dtype=np.uint8)
+
+    def reset(self) -> None:
+        self.buffer.clear()
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """Append data and return every complete record found, as a structured array of self.dtype"""
+        self.buffer.extend(data)
+        blocks = []
+        while len(self.buffer) >= self.frame_size:
+            start = self.buffer.find(self.sync)
+            if start < 0:
+                # Keep a possible partial sync word at the end
+                del self.buffer[:len(self.buffer) - len(self.sync) + 1]
+                self.resyncs += 1
+                break
+            if start > 0:
+                del self.buffer[:start]
+                self.resyncs += 1
+                continue
+
+            count = len(self.buffer) // self.frame_size
+            raw = bytes(self.buffer[:count * self.frame_size])  # One copy out of the mutable buffer
+            frames = np.frombuffer(raw, dtype=self.frame_dtype)
+            sync_ok = (np.frombuffer(raw, dtype=np.uint8).reshape(count, self.frame_size)[:, :len(self.sync)] == self._sync_bytes).all(axis=1)
+            bad = np.flatnonzero(~sync_ok)
+            good = count if bad.size == 0 else int(bad[0])
+            if good:
+                blocks.append(frames['record'][:good])
+            if good == count:
+                del self.buffer[:count * self.frame_size]
+            else:
+                # Lost alignment, look for the next sync word past the broken frame start
+                del self.buffer[:good * self.frame_size + 1]
+                self.resyncs += 1
+
+        if not blocks:
+            return np.empty(0, dtype=self.dtype)
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
@@ -0,0 +1,147 @@
+"""
+Session files: the raw chunks received from a serial port with their monotonic receive timestamps.
+
+    <path>       header, then one record per chunk: float64 timestamp, uint32 length, data (little endian)
+    <path>.idx   sparse time index, one (float64 timestamp, uint64 record offset) entry per index_interval seconds
+
+The index is written while recording, always after the records it points to are flushed, so a capture
+that was cut short stays readable. Seeking is a binary search in the index plus a short forward scan.
+If the index is missing it is rebuilt by scanning the records once.
+"""
+
+import struct
+import typing as T
+
+import numpy as np
+
+MAGIC = b'SERREC01'
+HEADER = struct.Struct('<8sdd')     # magic, wall clock start (time.time), monotonic start (time.monotonic)
+RECORD = struct.Struct('<dI')       # monotonic timestamp, data length
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('offset', '<u8')])
+
+
+def index_path(path: str) -> str:
+    return path + '.idx'
+
+
+class SessionWriter:
+    def __init__(self, path: str, wall_start: float, monotonic_start: float, index_interval: float = 1.0, buffer_size: int = 1 << 20) -> None:
+        self.path = path
+        self.index_interval = float(index_interval)
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._index = open(index_path(path), 'wb')
+        self._file.write(HEADER.pack(MAGIC, wall_start, monotonic_start))
+        self._offset = HEADER.size
+        self._next_index = -np.inf
+        self.chunks = 0
+        self.bytes_written = 0
+
+    def write(self, timestamp: float, data: bytes) -> None:
+        if timestamp >= self._next_index:
+            # Index entries must never point past the flushed data
+            self._file.flush()
+            self._index.write(np.array([(timestamp, self._offset)], dtype=INDEX_DTYPE).tobytes())
+            self._index.flush()
+            self._next_index = timestamp + self.index_interval
+        self._file.write(RECORD.pack(timestamp, len(data)))
+        self._file.write(data)
+        self._offset += RECORD.size + len(data)
+        self.chunks += 1
+        self.bytes_written += len(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+
+class SessionReader:
+    """Timestamps passed to and returned by the reader are seconds since the start of the session"""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, self.wall_start, self.monotonic_start = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a session file")
+        try:
+            with open(index_path(path), 'rb') as index_file:
+                raw = index_file.read()
+            # An interrupted capture may end in a partial entry
+            self.index = np.frombuffer(raw[:len(raw) - len(raw) % INDEX_DTYPE.itemsize], dtype=INDEX_DTYPE)
+        except FileNotFoundError:
+            self.index = self._build_index()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'SessionReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def duration(self) -> float:
+        """Time of the last indexed chunk plus the chunks after it"""
+        if self.index.size == 0:
+            return 0.0
+        last = 0.0
+        for last, _ in self.chunks(float(self.index['timestamp'][-1]) - self.monotonic_start):
+            pass
+        return last
+
+    def seek(self, t: float) -> int:
+        """File offset of the first record at or after t seconds, found in O(log n) plus a short scan"""
+        if self.index.size == 0:
+            return HEADER.size
+        target = self.monotonic_start + t
+        i = int(np.searchsorted(self.index['timestamp'], target, side='right')) - 1
+        offset = int(self.index['offset'][max(i, 0)])
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return offset
+            timestamp, length = RECORD.unpack(header)
+            if timestamp >= target:
+                return offset
+            offset += RECORD.size + length
+            self._file.seek(offset)
+
+    def chunks(self, start: float = 0.0, end: T.Optional[float] = None) -> T.Iterator[T.Tuple[float, bytes]]:
+        """Yield (t, data) of every chunk received from start until end seconds"""
+        offset = self.seek(start) if start > 0 else HEADER.size
+        stop = np.inf if end is None else self.monotonic_start + end
+        while True:
+            self._file.seek(offset)     # The file may have been moved by another reader call between two chunks
+            header = self._file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            timestamp, length = RECORD.unpack(header)
+            if timestamp > stop:
+                return
+            data = self._file.read(length)
+            if len(data) < length:
+                return  # Record cut short by an interrupted capture
+            offset += RECORD.size + length
+            yield timestamp - self.monotonic_start, data
+
+    def _build_index(self, interval: float = 1.0) -> np.ndarray:
+        entries = []
+        next_index = -np.inf
+        offset = HEADER.size
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                break
+            timestamp, length = RECORD.unpack(header)
+            if timestamp >= next_index:
+                entries.append((timestamp, offset))
+                next_index = timestamp + interval
+            offset += RECORD.size + length
+            self._file.seek(offset)
+        return np.array(entries, dtype=INDEX_DTYPE)
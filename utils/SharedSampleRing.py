@@ -0,0 +1,141 @@
+"""
+Ring of timestamped samples in shared memory, written by one process and read by any number of others.
+
+Layout: a header of int64 (magic, capacity, channels, claimed, written), then capacity timestamps and capacity rows
+of channels float64 values. written is the total number of samples ever written and is only stored after their
+values, so it works as a lock-free sequence counter: sample i is in slot i % capacity. Before touching any slot the
+writer raises claimed to the end of what it is about to write. A reader copies the slots it wants, then reads
+claimed: every copied sample older than claimed - capacity may have been overwritten during the copy and is
+dropped instead of being returned torn. Readers get read-only views and, without a lock, never block the writer.
+
+That protocol relies on the stores of the writer becoming visible to the readers in program order, which x86 and
+x86-64 guarantee. numpy stores are plain stores without memory barriers, so on ARM and other weakly ordered CPUs a
+reader could see written raised before the values it covers. There, give the writer and every reader the same
+multiprocessing Lock and they hold it while they touch the ring (LOCK_FREE tells which case applies);
+AcquisitionProcess does that by itself.
+"""
+
+import contextlib
+import platform
+import typing as T
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC = 0x53414d5052494e47   # 'SAMPRING'
+HEADER_FIELDS = 5
+_MAGIC, _CAPACITY, _CHANNELS, _CLAIMED, _WRITTEN = range(HEADER_FIELDS)
+
+# Total store order: the lock-free protocol is safe without a lock
+LOCK_FREE = platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i486', 'i586', 'i686', 'x86')
+
+
+class SharedSampleRing:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool, writable: bool, lock: T.Any = None) -> None:
+        self.shm = shm
+        self.owner = owner
+        self._lock = lock if lock is not None else contextlib.nullcontext()
+        self._header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if self._header[_MAGIC] != MAGIC:
+            raise ValueError(f"{shm.name} is not a sample ring")
+        self.capacity = int(self._header[_CAPACITY])
+        self.channels = int(self._header[_CHANNELS])
+        offset = HEADER_FIELDS * 8
+        self.timestamps = np.ndarray((self.capacity,), dtype=np.float64, buffer=shm.buf, offset=offset)
+        offset += self.capacity * 8
+        self.values = np.ndarray((self.capacity, self.channels), dtype=np.float64, buffer=shm.buf, offset=offset)
+        if not writable:
+            self.timestamps.flags.writeable = False
+            self.values.flags.writeable = False
+
+    @classmethod
+    def create(cls, capacity: int, channels: int, name: T.Optional[str] = None, lock: T.Any = None) -> 'SharedSampleRing':
+        """
+        New ring owned by the caller, who unlinks it. The caller reads, the process attaching with writable=True writes.
+        lock is a multiprocessing Lock shared by all of them, needed when LOCK_FREE is False
+        """
+        size = HEADER_FIELDS * 8 + capacity * 8 * (1 + channels)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[_CAPACITY] = capacity
+        header[_CHANNELS] = channels
+        header[_CLAIMED] = 0
+        header[_WRITTEN] = 0
+        header[_MAGIC] = MAGIC
+        del header
+        return cls(shm, owner=True, writable=False, lock=lock)
+
+    @classmethod
+    def attach(cls, name: str, writable: bool = False, lock: T.Any = None) -> 'SharedSampleRing':
+        return cls(shared_memory.SharedMemory(name=name), owner=False, writable=writable, lock=lock)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def written(self) -> int:
+        return int(self._header[_WRITTEN])
+
+    def write(self, values: np.ndarray, timestamps: np.ndarray) -> None:
+        """Append samples, overwriting the oldest. Single writer only"""
+        n = values.shape[0]
+        if n == 0:
+            return
+        start = self.written
+        if n > self.capacity:
+            values, timestamps = values[-self.capacity:], timestamps[-self.capacity:]
+            start += n - self.capacity
+        end = start + values.shape[0]
+        with self._lock:
+            self._header[_CLAIMED] = end
+            for slots, part in self._slots(start, end):
+                self.values[slots] = values[part]
+                self.timestamps[slots] = timestamps[part]
+            # Publish only once the values are in place
+            self._header[_WRITTEN] = end
+
+    def read(self, since: int, max_samples: T.Optional[int] = None) -> T.Tuple[int, np.ndarray, np.ndarray]:
+        """
+        Copies of the samples written since sequence number since, at most the newest max_samples.
+        Returns the sequence number of the first sample returned, its timestamps and values; pass
+        first + len(timestamps) as since next time. Samples lapped by the writer are skipped.
+        """
+        with self._lock:
+            end = self.written
+            start = max(since, end - self.capacity)
+            if max_samples is not None:
+                start = max(start, end - max_samples)
+            timestamps = np.empty(max(0, end - start))
+            values = np.empty((timestamps.shape[0], self.channels))
+            for slots, part in self._slots(start, end):
+                timestamps[part] = self.timestamps[slots]
+                values[part] = self.values[slots]
+            # The writer may have lapped the oldest slots while they were copied
+            lapped = int(self._header[_CLAIMED]) - self.capacity - start
+        if lapped > 0:
+            return start + lapped, timestamps[lapped:], values[lapped:]
+        return start, timestamps, values
+
+    def latest(self, count: int) -> T.Tuple[np.ndarray, np.ndarray]:
+        """Copies of the newest count samples"""
+        _, timestamps, values = self.read(0, count)
+        return timestamps, values
+
+    def close(self) -> None:
+        # The views must go before the mapping can be closed
+        del self._header, self.timestamps, self.values
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def _slots(self, start: int, end: int) -> T.Iterator[T.Tuple[slice, slice]]:
+        """(ring slots, positions in the copy) of sequence numbers start..end, in at most two runs"""
+        if end <= start:
+            return
+        first = start % self.capacity
+        count = end - start
+        head = min(count, self.capacity - first)
+        yield slice(first, first + head), slice(0, head)
+        if head < count:
+            yield slice(0, count - head), slice(head, count)
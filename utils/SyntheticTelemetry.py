@@ -0,0 +1,56 @@
+"""
+Deterministic synthetic IMU streams for replay and benchmarks.
+
+A stream is an iterator of (t, data) chunks: t in seconds since the start, data the bytes a device
+would have sent by then. Values are smooth sines with a little seeded noise, so runs are reproducible.
+"""
+
+import typing as T
+
+import numpy as np
+
+FIELD_COUNT = 9
+
+Chunk = T.Tuple[float, bytes]
+
+
+def imu_values(t: np.ndarray, seed: int = 0) -> np.ndarray:
+    """(len(t), 9) accel, gyro and mag values at times t"""
+    rng = np.random.default_rng(seed)
+    freqs = np.array([0.5, 0.7, 1.1, 2.0, 2.3, 2.9, 0.1, 0.13, 0.17])
+    phases = np.arange(FIELD_COUNT) * 0.4
+    values = np.sin(2 * np.pi * freqs * t[:, None] + phases)
+    return values + 0.01 * rng.standard_normal(values.shape)
+
+
+def encode_csv(values: np.ndarray, timestamps: np.ndarray) -> bytes:
+    """One 'v0,...,v8' line per sample, the format TelemetryHandler parses by default"""
+    lines = [','.join(f'{v:.4f}' for v in row) for row in values]
+    return ('\n'.join(lines) + '\n').encode('ascii') if lines else b''
+
+
+def binary_encoder(dtype: np.dtype, sync: bytes) -> T.Callable[[np.ndarray, np.ndarray], bytes]:
+    """Encoder for sync word + record frames, dtype must have a 'values' field and may have a 'timestamp' field (microseconds)"""
+    frame_dtype = np.dtype([('sync', f'V{len(sync)}'), ('record', dtype)])
+
+    def encode(values: np.ndarray, timestamps: np.ndarray) -> bytes:
+        frames = np.zeros(values.shape[0], dtype=frame_dtype)
+        frames['sync'] = np.frombuffer(sync, dtype=f'V{len(sync)}')[0]
+        frames['record']['values'] = values
+        if 'timestamp' in dtype.names:
+            frames['record']['timestamp'] = (timestamps * 1e6).astype(np.uint64) & 0xFFFFFFFF
+        return frames.tobytes()
+    return encode
+
+
+def imu_stream(rate_hz: float = 1000.0, duration: float = 10.0, chunk_ms: float = 10.0,
+               encode: T.Callable[[np.ndarray, np.ndarray], bytes] = encode_csv, seed: int = 0) -> T.Iterator[Chunk]:
+    """Chunks of the samples a device streaming at rate_hz sends every chunk_ms, for duration seconds"""
+    per_chunk = rate_hz * chunk_ms / 1000.0
+    chunk_count = int(np.ceil(duration * 1000.0 / chunk_ms))
+    sent = 0
+    for chunk in range(1, chunk_count + 1):
+        total = int(round(min(chunk * per_chunk, rate_hz * duration)))
+        t = np.arange(sent, total) / rate_hz
+        sent = total
+        yield chunk * chunk_ms / 1000.0, encode(imu_values(t, seed + chunk), t)
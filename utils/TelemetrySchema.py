@@ -0,0 +1,223 @@
+"""
+Declarative telemetry formats, so a firmware variant is a schema instead of parser code.
+
+A TelemetrySchema lists the channels a device sends (name, binary type, unit, scale and offset) and how they are
+framed: CSV lines, or binary records behind a sync word. The decode step of a schema (which columns hold values
+and which the device clock, the float conversion, the scaling) is compiled once by compile_schema and cached, and
+every SchemaParser of that schema shares it. Decoding a chunk is then the same few numpy calls a hand-written
+parser makes. Schemas registered by name with register_schema can be selected per port.
+"""
+
+import typing as T
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from utils.SerialFraming import BinaryFrameDecoder
+
+FRAMINGS = ('csv', 'binary')
+
+
+@dataclass(frozen=True)
+class Channel:
+    name: str
+    dtype: str = '<f4'      # Type in binary records, CSV values are always read as float
+    unit: str = ''
+    scale: float = 1.0      # value = raw * scale + offset
+    offset: float = 0.0
+
+
+@dataclass(frozen=True)
+class TelemetrySchema:
+    name: str
+    channels: T.Tuple[Channel, ...]
+    framing: str = 'csv'
+    sync: bytes = b''                   # Sync word before every binary record
+    timestamp: T.Optional[str] = None   # Channel holding the device clock, see utils/ClockSync.py
+    tick_seconds: float = 1e-6
+    wrap: T.Optional[int] = 1 << 32
+
+    def __post_init__(self) -> None:
+        # Channels may be given as names or dicts of Channel fields
+        channels = tuple(Channel(c) if isinstance(c, str) else Channel(**c) if isinstance(c, dict) else c
+                         for c in self.channels)
+        object.__setattr__(self, 'channels', channels)
+        names = [c.name for c in channels]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Schema {self.name!r} has duplicate channel names")
+        if self.framing not in FRAMINGS:
+            raise ValueError(f"Unknown framing {self.framing!r}, expected one of {FRAMINGS}")
+        if self.framing == 'binary' and not self.sync:
+            raise ValueError(f"Binary schema {self.name!r} needs a sync word")
+        if self.timestamp is not None and self.timestamp not in names:
+            raise ValueError(f"Timestamp channel {self.timestamp!r} is not in schema {self.name!r}")
+        if not self.columns:
+            raise ValueError(f"Schema {self.name!r} has no value channels")
+
+    @property
+    def columns(self) -> T.Tuple[str, ...]:
+        """Names of the value channels, in order. The timestamp channel is not one of them"""
+        return tuple(c.name for c in self.channels if c.name != self.timestamp)
+
+    @property
+    def units(self) -> T.Dict[str, str]:
+        return {c.name: c.unit for c in self.channels}
+
+    @property
+    def record_dtype(self) -> np.dtype:
+        """Layout of one binary record, after the sync word"""
+        return np.dtype([(c.name, c.dtype) for c in self.channels])
+
+    @classmethod
+    def from_dict(cls, spec: T.Dict[str, T.Any]) -> 'TelemetrySchema':
+        """From a JSON-like dict, with the sync word as a hex string"""
+        spec = dict(spec)
+        if isinstance(spec.get('sync'), str):
+            spec['sync'] = bytes.fromhex(spec['sync'])
+        spec['channels'] = tuple(spec.get('channels', ()))
+        return cls(**spec)
+
+
+class ParsedBlock(T.NamedTuple):
+    values: np.ndarray                  # (samples, len(schema.columns)) float64, scaled
+    ticks: T.Optional[np.ndarray]       # Raw device clock of every sample, if the schema has one
+    records: T.Optional[np.ndarray]     # Binary framing: the structured records as received
+    malformed: int                      # CSV lines skipped in this chunk
+
+
+Decode = T.Callable[[np.ndarray], T.Tuple[np.ndarray, T.Optional[np.ndarray]]]
+
+
+def _scaler(channels: T.Sequence[Channel]) -> T.Callable[[np.ndarray], np.ndarray]:
+    scale = np.array([c.scale for c in channels])
+    offset = np.array([c.offset for c in channels])
+    if (scale == 1.0).all() and (offset == 0.0).all():
+        return lambda values: values
+    if (offset == 0.0).all():
+        def apply(values: np.ndarray) -> np.ndarray:
+            values *= scale
+            return values
+        return apply
+
+    def apply(values: np.ndarray) -> np.ndarray:
+        values *= scale
+        values += offset
+        return values
+    return apply
+
+
+@lru_cache(maxsize=None)
+def compile_schema(schema: TelemetrySchema) -> Decode:
+    """Decode step of a schema: parsed CSV rows or binary records to (float64 values, raw ticks or None)"""
+    value_channels = [c for c in schema.channels if c.name != schema.timestamp]
+    scale = _scaler(value_channels)
+
+    if schema.framing == 'csv':
+        value_index = [i for i, c in enumerate(schema.channels) if c.name != schema.timestamp]
+        first = value_index[0]
+        # A contiguous run of columns is a slice instead of a gather
+        columns = slice(first, first + len(value_index)) if value_index == list(range(first, first + len(value_index))) else value_index
+        ticks_index = [c.name for c in schema.channels].index(schema.timestamp) if schema.timestamp is not None else None
+
+        def decode_csv(rows: np.ndarray) -> T.Tuple[np.ndarray, T.Optional[np.ndarray]]:
+            ticks = rows[:, ticks_index] if ticks_index is not None else None
+            return scale(np.ascontiguousarray(rows[:, columns])), ticks
+        return decode_csv
+
+    names = [c.name for c in value_channels]
+    timestamp = schema.timestamp
+    record_dtype = schema.record_dtype
+    item = np.dtype(value_channels[0].dtype)
+    offsets = [record_dtype.fields[name][1] for name in names]
+    packed = all(np.dtype(c.dtype) == item for c in value_channels) and \
+        offsets == list(range(offsets[0], offsets[0] + item.itemsize * len(names), item.itemsize))
+
+    if packed:
+        # Values of one type back to back: view them as one (channels,) subarray field and convert in one pass
+        values_dtype = np.dtype({'names': ['values'], 'formats': [(item, (len(names),))],
+                                 'offsets': [offsets[0]], 'itemsize': record_dtype.itemsize})
+
+        def decode_packed(records: np.ndarray) -> T.Tuple[np.ndarray, T.Optional[np.ndarray]]:
+            values = np.ascontiguousarray(records.view(values_dtype)['values'], dtype=np.float64)
+            return scale(values), records[timestamp] if timestamp is not None else None
+        return decode_packed
+
+    def decode_columns(records: np.ndarray) -> T.Tuple[np.ndarray, T.Optional[np.ndarray]]:
+        values = np.empty((records.shape[0], len(names)))
+        for i, name in enumerate(names):
+            values[:, i] = records[name]
+        return scale(values), records[timestamp] if timestamp is not None else None
+    return decode_columns
+
+
+def parse_csv_lines(chunk: bytes, field_count: int) -> T.Tuple[np.ndarray, int]:
+    """Newline-delimited CSV records to a (records, field_count) float array and the number of malformed lines skipped"""
+    lines = [line for line in chunk.replace(b'\r', b'').split(b'\n') if line.strip()]
+    separators = field_count - 1
+    good = [line for line in lines if line.count(b',') == separators]
+    malformed = len(lines) - len(good)
+
+    try:
+        values = np.fromstring(b','.join(good).decode('ascii', errors='replace'), sep=',') if good else np.empty(0)
+    except ValueError:
+        values = None   # Text that is not a number
+    if values is None or values.size != len(good) * field_count:
+        # Some field is not a number, fall back to parsing line by line
+        rows = []
+        for line in good:
+            try:
+                rows.append([float(value) for value in line.split(b',')])
+            except ValueError:
+                malformed += 1
+        values = np.array(rows, dtype=float)
+    return values.reshape(-1, field_count), malformed
+
+
+class SchemaParser:
+    """Streaming parser for one schema: feed it chunks as they arrive, it decodes every complete record"""
+    def __init__(self, schema: TelemetrySchema) -> None:
+        self.schema = schema
+        self._decode = compile_schema(schema)
+        self._partial_line = bytearray()
+        self.frame_decoder = BinaryFrameDecoder(schema.record_dtype, schema.sync) if schema.framing == 'binary' else None
+
+    def reset(self) -> None:
+        self._partial_line.clear()
+        if self.frame_decoder is not None:
+            self.frame_decoder.reset()
+
+    def feed(self, data: bytes) -> ParsedBlock:
+        if self.frame_decoder is not None:
+            records = self.frame_decoder.decode(data)
+            values, ticks = self._decode(records)
+            return ParsedBlock(values, ticks, records, 0)
+
+        self._partial_line.extend(data)
+        end = self._partial_line.rfind(b'\n')
+        if end < 0:
+            return ParsedBlock(np.empty((0, len(self.schema.columns))), None, None, 0)
+        chunk = bytes(self._partial_line[:end])
+        del self._partial_line[:end + 1]
+        rows, malformed = parse_csv_lines(chunk, len(self.schema.channels))
+        values, ticks = self._decode(rows)
+        return ParsedBlock(values, ticks, None, malformed)
+
+
+_SCHEMAS: T.Dict[str, TelemetrySchema] = {}
+
+
+def register_schema(schema: TelemetrySchema) -> TelemetrySchema:
+    _SCHEMAS[schema.name] = schema
+    return schema
+
+
+def get_schema(name: str) -> TelemetrySchema:
+    try:
+        return _SCHEMAS[name]
+    except KeyError:
+        raise KeyError(f"Unknown telemetry schema {name!r}, registered: {', '.join(_SCHEMAS) or 'none'}") from None
+
+
+def schema_names() -> T.List[str]:
+    return list(_SCHEMAS)
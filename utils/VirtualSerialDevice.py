@@ -0,0 +1,122 @@
+"""
+Pseudo-terminal device streaming synthetic IMU samples, so the real QSerialPort path can be exercised without hardware.
+
+Open port_name with a SerialPortHandler. A writer thread sends the samples that are due every chunk_ms, like
+a board streaming at rate_hz. The last channel of every sample carries its sequence number, so a receiver can
+match samples to their send time (send_time) and find missing ones. What the host writes is collected in
+received while the device runs and send() answers with raw bytes (rate_hz=0 streams no samples).
+Linux/macOS only (os.openpty).
+
+Like a UART, the device does not wait for the host: when the pty buffer is full the due samples are dropped
+and counted in dropped_samples.
+"""
+
+import errno
+import os
+import threading
+import time
+import tty
+import typing as T
+
+import numpy as np
+
+from utils.SyntheticTelemetry import imu_values, encode_csv
+
+SEQUENCE_CHANNEL = 8
+
+
+class VirtualSerialDevice:
+    def __init__(self, rate_hz: float = 1000.0, encode: T.Callable[[np.ndarray, np.ndarray], bytes] = encode_csv,
+                 chunk_ms: float = 2.0) -> None:
+        self.rate_hz = float(rate_hz)
+        self.encode = encode
+        self.chunk_ms = float(chunk_ms)
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        tty.setraw(self._master)
+        os.set_blocking(self._master, False)
+        self.port_name = os.ttyname(self._slave)
+
+        self.sent_samples = 0
+        self.dropped_samples = 0
+        self.bytes_sent = 0
+        self.received = bytearray()     # What the host wrote to the device
+        self._send_times: T.List[T.Tuple[int, float]] = []  # (first sequence number of a chunk, time.monotonic() it was written)
+        self._thread: T.Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='VirtualSerialDevice', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def send(self, data: bytes) -> int:
+        """Write raw bytes to the host outside the sample stream, e.g. XON/XOFF. Returns the bytes written"""
+        return self._write(data)
+
+    def send_time(self, sequence: np.ndarray) -> np.ndarray:
+        """time.monotonic() at which the samples with these sequence numbers were written"""
+        if not self._send_times:
+            return np.full(np.shape(sequence), np.nan)
+        starts, times = np.array(self._send_times).T
+        index = np.searchsorted(starts, sequence, side='right') - 1
+        return np.where(index >= 0, times[np.maximum(index, 0)], np.nan)
+
+    def _write(self, data: bytes) -> int:
+        try:
+            return os.write(self._master, data)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return 0
+            raise
+
+    def _read_host(self) -> None:
+        try:
+            self.received.extend(os.read(self._master, 65536))
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EIO):
+                raise
+
+    def _run(self) -> None:
+        start = time.monotonic()
+        sequence = 0
+        pending = b''   # Rest of a partially written chunk, finished before anything new
+        while self._running:
+            self._read_host()
+            if pending:
+                pending = pending[self._write(pending):]
+            due = int((time.monotonic() - start) * self.rate_hz)
+            if due > sequence and not pending:
+                seq = np.arange(sequence, due)
+                values = imu_values(seq / self.rate_hz)
+                values[:, SEQUENCE_CHANNEL] = seq
+                data = self.encode(values, seq / self.rate_hz)
+                now = time.monotonic()
+                written = self._write(data)
+                if written == 0:
+                    self.dropped_samples += due - sequence
+                else:
+                    self._send_times.append((sequence, now))
+                    self.sent_samples += due - sequence
+                    self.bytes_sent += len(data)
+                    pending = data[written:]
+                sequence = due
+            time.sleep(self.chunk_ms / 1000.0)
+        # Its samples are already counted as sent, finish the chunk being written
+        deadline = time.monotonic() + 1.0
+        while pending and time.monotonic() < deadline:
+            pending = pending[self._write(pending):]
+            time.sleep(self.chunk_ms / 1000.0)